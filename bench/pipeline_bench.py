@@ -0,0 +1,223 @@
+"""Headless end-to-end pipeline benchmark.
+
+Runs the real MainWindow under Qt's offscreen platform, fed by the DummyDaq
+simulator (or a ReplayDaq log) at increasing sample rates, and records
+sustained throughput, end-to-end latency, plot frame time, logger throughput
+and peak memory. Results go to bench/results/<commit>_<timestamp>.json so
+runs from different commits can be diffed.
+
+    python -m bench.pipeline_bench
+    python -m bench.pipeline_bench --rates 1000 10000 50000 --duration 10
+    python -m bench.pipeline_bench --replay logs_NEW/daq_log_XXXX.csv --speeds 1 10 0
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import numpy as np
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtCore import QTimer
+
+from daq.dummy_daq import DummyDaq
+from daq.replay_daq import ReplayDaq
+from logging_data.csv_logger import CSVLogger
+from daq.channels import CHANNELS
+
+try:
+    import resource # Not on Windows
+except ImportError:
+    resource = None
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+def percentiles(values):
+    if not values:
+        return None
+    v = np.asarray(values) * 1000
+    return {
+        "p50_ms": float(np.percentile(v, 50)),
+        "p90_ms": float(np.percentile(v, 90)),
+        "p99_ms": float(np.percentile(v, 99)),
+        "max_ms": float(v.max()),
+    }
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # KB on Linux, bytes on macOS
+    return rss / 1024 / (1024 if sys.platform == "darwin" else 1)
+
+
+def run_window(app, daq, duration, offered_rate):
+    # Imported here so the offscreen platform is set up first
+    from gui.main_window import MainWindow
+
+    window = MainWindow(daq=daq)
+    window.show()
+    window.start_logging()
+
+    latencies = []   # block read (DAQ thread "read" stamp) -> handled
+    staleness = []   # oldest sample's data time -> handled, only meaningful on the monotonic clock
+    frame_times = []
+    samples = [0]
+
+    # Runs after MainWindow.handle_new_block (connected later, same thread)
+    def on_block(block):
+        now_ns = time.monotonic_ns()
+        samples[0] += len(block)
+        if "read" in block.stamps:
+            latencies.append((now_ns - block.stamps["read"]) / 1e9)
+        staleness.append(now_ns / 1e9 - block.t[0])
+    window.daq_thread.block_ready.connect(on_block)
+
+    # Time every render pass
+    renderer = window.renderer
+    renderer.timer.timeout.disconnect()
+    def timed_render():
+        t0 = time.perf_counter()
+        renderer.render()
+        frame_times.append(time.perf_counter() - t0)
+    renderer.timer.timeout.connect(timed_render)
+
+    t_start = time.monotonic()
+    QTimer.singleShot(int(duration * 1000), app.quit)
+    app.exec()
+    elapsed = time.monotonic() - t_start
+
+    logger_stats = window.logger.stats()
+    window.close()
+
+    result = {
+        "offered_rate": offered_rate,
+        "duration_s": elapsed,
+        "samples": samples[0],
+        "sustained_samples_per_s": samples[0] / elapsed,
+        "latency": percentiles(latencies),
+        "staleness": percentiles(staleness), # Data time vs handling time, separate from latency
+        "frame_time": percentiles(frame_times),
+        "frames": len(frame_times),
+        "logger_rows_per_s": logger_stats["rows_written"] / elapsed,
+        "logger": logger_stats,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+    if offered_rate:
+        result["kept_up"] = result["sustained_samples_per_s"] >= 0.95 * offered_rate
+    return result
+
+
+def logger_throughput(rows=200000, block=1000):
+    # Raw CSVLogger throughput, threaded mode, measured until close() returns
+    logger = CSVLogger(["time_s"] + CHANNELS + ["event"], folder=".", prefix="bench",
+                       threaded=True, max_queued_rows=rows)
+    data = np.random.default_rng(0).standard_normal((len(CHANNELS), block))
+    times = np.arange(block, dtype=float)
+
+    t0 = time.perf_counter()
+    for _ in range(rows // block):
+        logger.write_block(times, data)
+    logger.close()
+    elapsed = time.perf_counter() - t0
+
+    stats = logger.stats()
+    return {
+        "rows": stats["rows_written"],
+        "rows_per_s": stats["rows_written"] / elapsed,
+        "mb_per_s": stats["bytes_written"] / elapsed / 1e6,
+        "dropped_rows": stats["dropped_rows"],
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(RESULTS_DIR), text=True,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rates", type=float, nargs="+", default=[1000, 5000, 20000, 50000],
+                        help="Simulator sample rates (Hz) to step through")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per run")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--replay", help="Drive from a recorded log instead of the simulator")
+    parser.add_argument("--speeds", type=float, nargs="+", default=[1, 10, 0],
+                        help="Replay speeds (0 = as fast as possible)")
+    parser.add_argument("--output", help="Result JSON path (default bench/results/...)")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    replay = os.path.abspath(args.replay) if args.replay else None
+    runs = []
+
+    # Loggers write into a scratch folder, not logs_NEW
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as scratch:
+        os.chdir(scratch)
+        try:
+            if replay:
+                for speed in args.speeds:
+                    print(f"--- replay {speed or 'max'}x ---")
+                    daq = ReplayDaq(replay, speed=speed or None)
+                    result = run_window(app, daq, args.duration, None)
+                    result["replay_speed"] = speed
+                    runs.append(result)
+            else:
+                for rate in args.rates:
+                    print(f"--- simulator {rate:.0f} Hz ---")
+                    daq = DummyDaq(rate_hz=rate, seed=args.seed)
+                    runs.append(run_window(app, daq, args.duration, rate))
+
+            print("--- CSVLogger throughput ---")
+            logger = logger_throughput()
+        finally:
+            os.chdir(cwd)
+
+    results = {
+        "commit": git_commit(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "platform": sys.platform,
+        "duration_s": args.duration,
+        "runs": runs,
+        "csv_logger": logger,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+    for r in runs:
+        lat = r["latency"] or {}
+        stale = r["staleness"] or {}
+        frame = r["frame_time"] or {}
+        print(
+            f"{r['offered_rate'] or r.get('replay_speed')!s:>8}: "
+            f"{r['sustained_samples_per_s']:10.0f} samples/s  "
+            f"latency p99 {lat.get('p99_ms', float('nan')):7.1f} ms  "
+            f"staleness p99 {stale.get('p99_ms', float('nan')):7.1f} ms  "
+            f"frame p99 {frame.get('p99_ms', float('nan')):6.1f} ms"
+        )
+    print(f"CSVLogger: {logger['rows_per_s']:.0f} rows/s, {logger['mb_per_s']:.1f} MB/s")
+
+    path = args.output
+    if not path:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        path = os.path.join(RESULTS_DIR, f"{results['commit']}_{stamp}.json")
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results saved to {path}")
+
+
+if __name__ == "__main__":
+    main()
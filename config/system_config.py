@@ -2,6 +2,14 @@
 T7_IP = "192.168.1.207"
 T7_PRO_IP = "192.168.1.208"
 
+# Reconnect after a lost handle: first retry after RECONNECT_BACKOFF_S, doubling up to the max
+RECONNECT_BACKOFF_S = 0.5
+RECONNECT_BACKOFF_MAX_S = 10.0
+
+# Device clock (CORE_TIMER) -> host monotonic clock fit, one point per interval, over the last N points
+CLOCK_SYNC_INTERVAL_S = 0.5
+CLOCK_SYNC_WINDOW = 120
+
 # Valves T7
 VALVES = ['Ox_Fill', 
           'Iso', 
@@ -24,7 +32,7 @@ PRESSURE_CHANNELS = ['Ox_tank_pressure',
 
 PRESSURE_MAP = {
     "Ox_tank_pressure": ("T7", "AIN0"),
-    "CC_Pressure": ("T7", "AIN1"),
+    "CC_pressure": ("T7", "AIN1"),
 }
 
 THRUST_MAP = {
@@ -43,10 +51,115 @@ TEMP_MAP = {
     "CC_temp": ("T7_PRO", "AIN1"),
 }
 
+# Thermocouples converted on the device (AIN extended features), read back in
+# THERMOCOUPLE_UNITS from <AIN>_EF_READ_A. Type: E, J, K, R, T, S, N, B or C.
+# A channel can override the cold junction with its own "cjc" entry.
+THERMOCOUPLE_EF = {
+    "Ox_tank_temp": {"tc_type": "K"},
+    "CC_temp": {"tc_type": "K"},
+}
+THERMOCOUPLE_UNITS = "C" # "K", "C" or "F", keep in line with TEMP_LIMITS/CHANNEL_UNITS
+# Cold junction: Modbus address of a Kelvin reading, scaled slope * reading + offset.
+# 60052 = TEMPERATURE_DEVICE_K (T7 internal sensor), 60050 = TEMPERATURE_AIR_K
+THERMOCOUPLE_CJC = {"address": 60052, "slope": 1.0, "offset": 0.0}
+
 # DAQ settings 
 DAQ_INTERVAL_MS = 100 
 MAX_DATA_POINTS = 1000 
 
+# Block mode: DAQ_Thread emits one array block per N samples or per latency target
+DAQ_BLOCK_SIZE = 50
+DAQ_BLOCK_LATENCY_MS = 100
+
+# Multi-rate acquisition (daq/multi_rate.py): each group polled at its own rate,
+# merged onto the fastest group's timeline. Fast group comes off the stream when STREAM_ENABLED
+MULTI_RATE_ENABLED = True
+CHANNEL_GROUPS = {
+    "fast": {"channels": PRESSURE_CHANNELS + ["thrust"], "rate_hz": 200}, # T7 pressures + load cell
+    "slow": {"channels": TEMP_CHANNELS, "rate_hz": 10},                   # T7_PRO thermocouples
+}
+SLOW_FILL = "hold" # "hold" = repeat last reading, "nan" = only on the row it arrived
+
+# Plot redraw rate, independent of the acquisition rate
+PLOT_FPS = 30
+
+# Streaming filters (daq/filters.py) for the plots and optionally the watchdogs,
+# one stage or a list of stages per channel. The logger always gets unfiltered full-rate data.
+FILTERS = {
+    "CC_pressure": [{"type": "median", "window": 5}, {"type": "iir", "cutoff_hz": 20}],
+    "Injector_pressure": {"type": "iir", "cutoff_hz": 20},
+    "thrust": {"type": "moving_average", "window": 10},
+}
+DISPLAY_DECIMATION = 8      # Plot a min/max pair per N (filtered) samples
+SAFETY_USE_FILTERED = False # Watchdogs see filtered data (fewer noise trips, adds filter delay)
+
+# Logging (threaded = writer thread with a bounded queue, never blocks the GUI)
+LOG_THREADED = True
+LOG_MAX_QUEUED_ROWS = 100000    # Rows dropped (and counted) beyond this
+LOG_FLUSH_INTERVAL_S = 1.0
+LOG_FSYNC = True
+LOG_FORMAT = "csv"              # "csv" or "binary" (chunked float64 columns, see binary_logger.py)
+LOG_CHUNK_ROWS = 4096           # Binary: rows per chunk
+LOG_COMPRESSION = None          # Binary: None, "zlib" or "lzma" per chunk
+LOG_LATENCY_INTERVAL_S = 0      # >0: write a pipeline latency summary event this often
+
+# Raw AIN volts -> engineering units for hardware backends (daq/calibration.py).
+# Placeholders, replace with the transducer datasheet / cal sheet numbers.
+CALIBRATION = {
+    # 0.5-4.5 V -> 0-1000 psi transducers
+    "Ox_tank_pressure": {"type": "linear", "gain": 250.0, "offset": -125.0},
+    "CC_pressure": {"type": "linear", "gain": 250.0, "offset": -125.0},
+    "Injector_pressure": {"type": "linear", "gain": 250.0, "offset": -125.0},
+    "Fill_pressure": {"type": "linear", "gain": 250.0, "offset": -125.0},
+    # Load cell amplifier, N per V
+    "thrust": {"type": "linear", "gain": 1000.0, "offset": 0.0},
+    # Type K thermocouples not in THERMOCOUPLE_EF, cold junction assumed at cjc_c
+    "Fill_temp": {"type": "thermocouple", "tc_type": "K", "cjc_c": 25.0},
+    "Injector_temp": {"type": "thermocouple", "tc_type": "K", "cjc_c": 25.0},
+    # Other forms:
+    # "thrust": {"type": "poly", "coeffs": [c0, c1, c2]},
+    # "thrust": {"type": "lut", "volts": [0.0, 1.0, 2.0], "values": [0.0, 480.0, 1000.0]},
+}
+LOG_RAW = True # Also log each calibrated channel's volts as <channel>_raw
+
+# Units written into log headers
+CHANNEL_UNITS = {
+    "Ox_tank_pressure": "psi",
+    "CC_pressure": "psi",
+    "Injector_pressure": "psi",
+    "Fill_pressure": "psi",
+    "Ox_tank_temp": "C",
+    "CC_temp": "C",
+    "Fill_temp": "C",
+    "Injector_temp": "C",
+    "thrust": "N",
+}
+
+# Stream mode (hardware-timed scans of PRESSURE_MAP/THRUST_MAP on the T7)
+STREAM_ENABLED = False
+STREAM_SCAN_RATE_HZ = 1000      # Scans/s, each scan = every streamed channel once
+STREAM_SCANS_PER_READ = 100     # Scans returned per eStreamRead (10 reads/s at 1 kHz)
+STREAM_BUFFER_SIZE = 10000      # Samples kept per channel on the host
+
+
+# Simulator (DummyDaq(rate_hz=SIM_RATE_HZ, ...)), see daq/signal_generator.py
+SIM_RATE_HZ = 1000
+SIM_SEED = 0
+SIM_PROFILES = {
+    "CC_pressure": {"base": 20, "noise": 2, "events": [
+        {"type": "ramp", "start": 10, "end": 11, "delta": 400},
+        {"type": "spike", "at": 10.5, "width": 0.01, "height": 100},
+        {"type": "step", "at": 16, "delta": -400},
+    ]},
+    "thrust": {"base": 0, "noise": 1, "events": [
+        {"type": "ramp", "start": 10, "end": 11, "delta": 800},
+        {"type": "noise_burst", "start": 11, "end": 16, "std": 20},
+        {"type": "step", "at": 16, "delta": -800},
+    ]},
+    "CC_temp": {"base": 22.5, "noise": 1.5, "events": [
+        {"type": "dropout", "start": 12, "end": 12.5},
+    ]},
+}
 
 # Safety limits
 PRESSURE_LIMITS = {
@@ -62,6 +175,17 @@ TEMP_LIMITS = {
     "Fill_temp": 60,
 }
 
+# Rate-of-change / rolling-statistic rules (safety/rule_engine.py)
+# window_s is in seconds, sized in samples from the acquisition rate. type: "rate" (units/s),
+# "mean", "std", or "deviation" (|rolling mean - expected|). Trips below "min" or above "max"
+SAFETY_RULES = [
+    # Chamber pressure spike or collapse, before the absolute limit is reached
+    {"channel": "CC_pressure", "type": "rate", "window_s": 0.02, "min": -10000, "max": 10000},
+    # Oscillating injector pressure
+    {"channel": "Injector_pressure", "type": "std", "window_s": 0.1, "max": 50},
+    # {"channel": "Ox_tank_pressure", "type": "deviation", "window_s": 0.1, "expected": 750, "max": 100},
+]
+
 HEARTBEAT_TIMEOUT_S = 1.0
 
 # Safe valve states
@@ -70,3 +194,12 @@ DIO_SAFE_STATES = {
     "Vent": False,
     "Ignition": False
 }
+
+# Hot fire sequence: (seconds from start, valve, state)
+IGNITION_SEQUENCE = [
+    (0.0, "Vent", False),
+    (5.0, "Ignition", True),  # Could maybe ask for manual input before this. Say if want to wait for N2O to pressurise
+    (8.0, "MOV", True),       # Igniter -> MOV offset
+    (8.5, "Ignition", False),
+]
+IGNITION_SPIN_S = 0.002 # Busy-wait this long before each step instead of sleeping
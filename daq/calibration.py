@@ -0,0 +1,100 @@
+import numpy as np
+import config.system_config as system_config
+from daq.channels import CHANNEL_INDEX
+
+# Raw AIN volts -> engineering units, a whole SampleBlock at a time.
+# CALIBRATION maps channel -> definition:
+#   {"type": "linear", "gain": 250.0, "offset": -125.0}        gain * V + offset
+#   {"type": "poly", "coeffs": [c0, c1, c2]}                     c0 + c1*V + c2*V^2 ...
+#   {"type": "lut", "volts": [...], "values": [...]}             piecewise linear
+#   {"type": "thermocouple", "tc_type": "K", "cjc_c": 25.0}      NIST inverse polynomial
+# Definitions are compiled once into arrays. All linear channels are converted
+# with one multiply-add over their rows, all poly/thermocouple channels with one
+# Horner pass over a zero-padded coefficient matrix, so the cost per block is a
+# fixed number of NumPy calls however many channels there are. Only LUT
+# channels are interpolated a row at a time. Unlisted channels pass through,
+# as do THERMOCOUPLE_EF channels, which the device already returns in degrees.
+
+# NIST ITS-90 inverse polynomials, thermocouple mV -> C, c0 first
+# (K: 0 to 500 C, J: 0 to 760 C, T: 0 to 400 C)
+TC_INVERSE = {
+    "K": [0.0, 2.508355e1, 7.860106e-2, -2.503131e-1, 8.315270e-2,
+          -1.228034e-2, 9.804036e-4, -4.413030e-5, 1.057734e-6, -1.052755e-8],
+    "J": [0.0, 1.978425e1, -2.001204e-1, 1.036969e-2, -2.549687e-4,
+          3.585153e-6, -5.344285e-8, 5.099890e-10],
+    "T": [0.0, 2.592800e1, -7.602961e-1, 4.637791e-2, -2.165394e-3,
+          6.048144e-5, -7.293422e-7],
+}
+
+# Seebeck coefficient near room temperature (mV/C), cold junction -> equivalent mV
+TC_SEEBECK = {"K": 0.0407, "J": 0.0517, "T": 0.0407}
+
+
+class Calibration:
+    def __init__(self, definitions=None):
+        definitions = system_config.CALIBRATION if definitions is None else definitions
+
+        linear, poly, self.luts = [], [], []
+        for ch, cal in definitions.items():
+            if ch not in CHANNEL_INDEX or ch in system_config.THERMOCOUPLE_EF:
+                continue
+            row = CHANNEL_INDEX[ch]
+            kind = cal["type"]
+
+            if kind == "linear":
+                linear.append((row, cal["gain"], cal.get("offset", 0.0)))
+            elif kind == "poly":
+                poly.append((row, 0.0, list(cal["coeffs"])))
+            elif kind == "thermocouple":
+                tc = cal.get("tc_type", "K")
+                if tc not in TC_INVERSE:
+                    raise ValueError(f"{ch}: unsupported thermocouple type {tc}")
+                # Polynomial is in mV, rescale so it takes volts directly
+                coeffs = [c * 1000.0 ** k for k, c in enumerate(TC_INVERSE[tc])]
+                shift = cal.get("cjc_c", 25.0) * TC_SEEBECK[tc] / 1000.0
+                poly.append((row, shift, coeffs))
+            elif kind == "lut":
+                volts = np.asarray(cal["volts"], dtype=float)
+                order = np.argsort(volts)
+                self.luts.append((row, volts[order], np.asarray(cal["values"], dtype=float)[order]))
+            else:
+                raise ValueError(f"{ch}: unknown calibration type {kind}")
+
+        self.linear_rows = np.array([r for r, _, _ in linear], dtype=int)
+        self.gain = np.array([[g] for _, g, _ in linear], dtype=float)
+        self.offset = np.array([[o] for _, _, o in linear], dtype=float)
+
+        # Coefficients padded with zeros to the highest degree (rows x degree+1)
+        degree = max((len(c) for _, _, c in poly), default=0)
+        self.poly_rows = np.array([r for r, _, _ in poly], dtype=int)
+        self.shift = np.array([[s] for _, s, _ in poly], dtype=float)
+        self.coeffs = np.array([c + [0.0] * (degree - len(c)) for _, _, c in poly], dtype=float)
+
+        # Channels that get converted, in CHANNELS order (their raw copies get logged)
+        self.rows = sorted([r for r, _, _ in linear] + [r for r, _, _ in poly] + [r for r, _, _ in self.luts])
+
+    def apply(self, raw):
+        # (channels x n) volts -> (channels x n) engineering units, raw left untouched
+        out = raw.copy()
+
+        if len(self.linear_rows):
+            out[self.linear_rows] = raw[self.linear_rows] * self.gain + self.offset
+
+        if len(self.poly_rows):
+            x = raw[self.poly_rows] + self.shift
+            y = np.repeat(self.coeffs[:, -1:], x.shape[1], axis=1)
+            for k in range(self.coeffs.shape[1] - 2, -1, -1):
+                y *= x
+                y += self.coeffs[:, k:k + 1]
+            out[self.poly_rows] = y
+
+        for row, volts, values in self.luts:
+            out[row] = np.interp(raw[row], volts, values)
+
+        return out
+
+    def process(self, block):
+        # In place on a SampleBlock, keeping the volts as block.raw
+        block.raw = block.data
+        block.data = self.apply(block.data)
+        return block
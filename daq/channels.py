@@ -0,0 +1,12 @@
+import config.system_config as system_config
+
+# Fixed channel order for every channels x samples array in the pipeline.
+# Row i of a block is always CHANNELS[i], so consumers index by number
+# instead of looking channels up by name on every sample.
+
+CHANNELS = system_config.PRESSURE_CHANNELS + system_config.TEMP_CHANNELS + ["thrust"]
+CHANNEL_INDEX = {name: i for i, name in enumerate(CHANNELS)}
+
+PRESSURE_IDX = [CHANNEL_INDEX[ch] for ch in system_config.PRESSURE_CHANNELS]
+TEMP_IDX = [CHANNEL_INDEX[ch] for ch in system_config.TEMP_CHANNELS]
+THRUST_IDX = CHANNEL_INDEX["thrust"]
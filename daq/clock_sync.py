@@ -0,0 +1,122 @@
+import threading
+import numpy as np
+import config.system_config as system_config
+
+# Maps one LabJack's clock onto the host monotonic clock.
+# CORE_TIMER counts at 40 MHz and wraps every 2^32 ticks (~107 s); it's read
+# in the same eReadNames as the data, bracketed by host timestamps. Each
+# (device time, host midpoint, round trip) point goes into a window spaced
+# CLOCK_SYNC_INTERVAL_S apart (keeping the lowest round trip in each slot),
+# and host = offset + (1 + drift) * device is fitted over the points with
+# the better half of round trips, so network delay spikes don't skew it.
+# A power-cycled device restarts CORE_TIMER near 0: a jump the host clock
+# can't account for (wrap included) drops the old points and fit.
+
+CORE_TIMER_HZ = 40e6
+CORE_TIMER_WRAP = 2 ** 32
+CLOCK_JUMP_TOLERANCE_S = 0.1 # Device vs host elapsed time mismatch that means the timer restarted
+
+
+class ClockSync:
+    def __init__(self, name, window=None, spacing_s=None):
+        self.name = name
+        self.window = window or system_config.CLOCK_SYNC_WINDOW
+        self.spacing = spacing_s or system_config.CLOCK_SYNC_INTERVAL_S
+        self.lock = threading.Lock()
+
+        self.last_ticks = None
+        self.wraps = 0
+
+        self.points = [] # [device_s, host_s, rtt_s]
+        self.last_update = float("-inf") # Host time of the last reading
+        self.fit = None  # (device origin, host at origin, slope)
+
+    def reset(self):
+        # Device restarted (reconnect/power cycle), its timer starts over
+        with self.lock:
+            self._clear()
+
+    def _clear(self):
+        self.last_ticks = None
+        self.wraps = 0
+        self.points = []
+        self.last_update = float("-inf")
+        self.fit = None
+
+    def unwrap(self, ticks):
+        # Raw 32-bit CORE_TIMER -> device seconds, counting rollovers
+        ticks = int(ticks)
+        if self.last_ticks is not None and ticks < self.last_ticks - CORE_TIMER_WRAP // 2:
+            self.wraps += 1
+        self.last_ticks = ticks
+        return (self.wraps * CORE_TIMER_WRAP + ticks) / CORE_TIMER_HZ
+
+    def device_seconds(self, ticks):
+        # Like unwrap() for a tick value read elsewhere (e.g. stream start stamp), no state change
+        with self.lock:
+            if self.last_ticks is None:
+                return int(ticks) / CORE_TIMER_HZ
+            base = self.wraps * CORE_TIMER_WRAP
+            candidates = np.array([base - CORE_TIMER_WRAP, base, base + CORE_TIMER_WRAP]) + int(ticks)
+            nearest = candidates[np.argmin(np.abs(candidates - (base + self.last_ticks)))]
+            return nearest / CORE_TIMER_HZ
+
+    def add(self, ticks, host_send, host_recv):
+        # Returns this reading's device time
+        with self.lock:
+            if self.last_ticks is not None:
+                # Timer advance (modulo one wrap) should match the host's elapsed time
+                elapsed = host_recv - self.last_update
+                advance = ((int(ticks) - self.last_ticks) % CORE_TIMER_WRAP) / CORE_TIMER_HZ
+                if abs(advance - elapsed) > CLOCK_JUMP_TOLERANCE_S:
+                    print(f"[CLOCK] {self.name} CORE_TIMER jumped ({advance:.3f}s vs {elapsed:.3f}s host), refitting")
+                    self._clear()
+
+            device_s = self.unwrap(ticks)
+            self.last_update = host_recv
+            point = [device_s, (host_send + host_recv) / 2, host_recv - host_send]
+
+            if self.points and device_s - self.points[-1][0] < self.spacing:
+                # Same slot, keep whichever crossed the network fastest
+                if point[2] < self.points[-1][2]:
+                    self.points[-1] = point
+            else:
+                self.points.append(point)
+                del self.points[:-self.window]
+                self._refit()
+            return device_s
+
+    def _refit(self):
+        p = np.array(self.points)
+        good = p[p[:, 2] <= np.median(p[:, 2])]
+        if len(good) < 3:
+            # Too few points for drift yet, offset only
+            self.fit = (p[-1, 0], p[-1, 1], 1.0)
+            return
+        d0, h0 = good[0, 0], good[0, 1]
+        slope, intercept = np.polyfit(good[:, 0] - d0, good[:, 1] - h0, 1)
+        self.fit = (d0, h0 + intercept, slope)
+
+    def to_host(self, device_s):
+        # Device seconds (scalar or array) -> host monotonic seconds
+        with self.lock:
+            if self.fit is None:
+                return None
+            d0, h0, slope = self.fit
+        return h0 + slope * (np.asarray(device_s) - d0)
+
+    def stats(self):
+        with self.lock:
+            if self.fit is None:
+                return None
+            p = np.array(self.points)
+            d0, h0, slope = self.fit
+            residual = p[:, 1] - (h0 + slope * (p[:, 0] - d0))
+            return {
+                "offset_s": float(h0 - d0), # host - device at the fit origin
+                "drift_ppm": float((slope - 1) * 1e6),
+                "rtt_min_ms": float(p[:, 2].min() * 1e3),
+                "rtt_median_ms": float(np.median(p[:, 2]) * 1e3),
+                "residual_ms": float(residual.std() * 1e3),
+                "points": len(p),
+            }
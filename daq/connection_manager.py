@@ -0,0 +1,94 @@
+try:
+    from labjack import ljm
+except ImportError: # Only needed against real hardware, a fake can be passed as ljm_module
+    ljm = None
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import config.system_config as system_config
+from daq.labjack_device import LabJackDevice
+
+# Opens every LabJack at once and keeps them connected.
+# A device whose handle dies (LJMError during a read/write) is marked lost and
+# reopened on its own thread with capped exponential backoff, then has its
+# channel configuration reapplied. The other device keeps acquiring meanwhile.
+# Pass ljm_module to run the whole thing against a mock.
+
+
+class ConnectionManager:
+    def __init__(self, addresses, ljm_module=None, backoff_s=None, backoff_max_s=None):
+        self.ljm = ljm_module or ljm
+        self.backoff_s = backoff_s or system_config.RECONNECT_BACKOFF_S
+        self.backoff_max_s = backoff_max_s or system_config.RECONNECT_BACKOFF_MAX_S
+
+        self.devices = {
+            name: LabJackDevice(ip, name, ljm_module=self.ljm, connect=False)
+            for name, ip in addresses.items()
+        }
+
+        # Called as (device name) from the reconnect threads
+        self.on_lost = []
+        self.on_reconnect = []
+
+        self.reconnecting = {}
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+
+    def open_all(self):
+        # All devices opened in parallel, any that fail go straight to reconnecting
+        with ThreadPoolExecutor(max_workers=len(self.devices)) as pool:
+            futures = {name: pool.submit(self._connect, dev) for name, dev in self.devices.items()}
+        for name, future in futures.items():
+            error = future.exception()
+            if error is not None:
+                print(f"{name} failed to open: {error}")
+                self.device_lost(name, error)
+
+    def _connect(self, device):
+        device.open()
+        try:
+            device.configure()
+        except Exception:
+            device.mark_lost()
+            raise
+
+    def device_lost(self, name, error=None):
+        # Safe to call repeatedly, only one reconnect thread per device
+        with self.lock:
+            if name in self.reconnecting or self.stopped.is_set():
+                return
+            self.devices[name].mark_lost()
+            thread = threading.Thread(target=self._reconnect_loop, args=(name,), daemon=True)
+            self.reconnecting[name] = thread
+
+        print(f"[CONNECTION] {name} lost: {error}")
+        for callback in self.on_lost:
+            callback(name)
+        thread.start()
+
+    def _reconnect_loop(self, name):
+        device = self.devices[name]
+        delay = self.backoff_s
+        attempt = 0
+
+        while not self.stopped.wait(delay):
+            attempt += 1
+            try:
+                self._connect(device)
+            except Exception as e: # Anything else would kill this thread and leave the device stuck
+                delay = min(delay * 2, self.backoff_max_s)
+                print(f"[CONNECTION] {name} reconnect attempt {attempt} failed: {e!r}, retry in {delay:.1f}s")
+                continue
+
+            with self.lock:
+                del self.reconnecting[name]
+            print(f"[CONNECTION] {name} reconnected after {attempt} attempt(s)")
+            for callback in self.on_reconnect:
+                callback(name)
+            return
+
+    def close(self):
+        self.stopped.set()
+        for thread in list(self.reconnecting.values()):
+            thread.join()
+        for device in self.devices.values():
+            device.close()
@@ -1,49 +1,286 @@
-from daq.labjack_device import LabJackDevice
+from daq.connection_manager import ConnectionManager
+from daq.labjack_stream import LabJackStream
+from daq.clock_sync import ClockSync
+from daq.labjack_device import read_register
 import config.system_config as system_config
-from labjack import ljm
+try:
+    from labjack import ljm
+except ImportError: # Only needed against real hardware, a fake can be passed as ljm_module
+    ljm = None
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import threading
+import time
 
 class DAQManager:
-    def __init__(self):
-        self.devices = {
-            "T7": LabJackDevice(system_config.T7_IP, "T7"),
-            "T7_PRO": LabJackDevice(system_config.T7_PRO_IP, "T7_PRO"),
-        }
+    returns_raw = True # AIN volts, see daq/calibration.py
+
+    def __init__(self, ljm_module=None):
+        self.ljm = ljm_module or ljm
+
+        self.stream = None
+        self.stream_wanted = False # Restart the stream when the T7 comes back
+
+        # Called with the source name every time a device/stream delivers data
+        self.on_heartbeat = []
+
+        # Called as (event name, monotonic time) on connection loss/recovery,
+        # so the gap in the data can be marked in the log
+        self.on_event = []
+
+        # Called with the device name once it is back and configured (e.g. re-apply the safe state)
+        self.on_reconnect = []
+
+        # Called with heartbeat_sources() whenever the polled devices or the stream change
+        self.on_sources_changed = []
+
+        # Both LabJacks opened in parallel, lost ones reconnect in the background
+        self.connections = ConnectionManager(
+            {"T7": system_config.T7_IP, "T7_PRO": system_config.T7_PRO_IP},
+            ljm_module=self.ljm,
+        )
+        self.connections.on_lost.append(self._device_lost)
+        self.connections.on_reconnect.append(self._device_reconnected)
+        self.devices = self.connections.devices
+
+        # Each device's CORE_TIMER mapped onto host monotonic time
+        self.clocks = {dev: ClockSync(dev) for dev in self.devices}
+
+        self.connections.open_all()
+
+        # One eReadNames batch per device, polled in parallel
+        self.read_batches = {}
+        self.read_latency = {dev: 0.0 for dev in self.devices} # Last read per device (s)
+        self.max_read_latency = {dev: 0.0 for dev in self.devices}
+        self.pool = ThreadPoolExecutor(max_workers=len(self.devices))
+
+        # Keeps every clock fed even when a device isn't otherwise being read
+        self.sync_stop = threading.Event()
+        self.sync_thread = threading.Thread(target=self._sync_loop, daemon=True)
+        self.sync_thread.start()
+
+        if system_config.STREAM_ENABLED:
+            self.start_stream()
+        else:
+            self.build_read_batches()
+
+    # Group every *_MAP channel by device -> (names, registers)
+    def build_read_batches(self):
+        self.read_batches = self.batches_for(None)
+        sources = self.heartbeat_sources()
+        for callback in self.on_sources_changed:
+            callback(sources)
+
+    def batches_for(self, wanted):
+        # Per-device (names, registers) for the `wanted` channels (None = all), minus streamed ones
+        streamed = set(self.stream.names) if self.stream else set()
+        batches = {}
+
+        for channel_map in (system_config.PRESSURE_MAP, system_config.TEMP_MAP, system_config.THRUST_MAP):
+            for name, (dev, ain) in channel_map.items():
+                if name in streamed or (wanted is not None and name not in wanted):
+                    continue
+                names, registers = batches.setdefault(dev, ([], []))
+                names.append(name)
+                registers.append(read_register(name, ain))
+
+        return batches
+
+    # STREAM MODE (fast T7 channels hardware-timed)
+    def start_stream(self, scan_rate=None):
+        if self.stream:
+            return
+        self.stream_wanted = True
+        if not self.devices["T7"].connected:
+            # Meanwhile the other devices are polled (and watched) as usual
+            print("T7 not connected, stream starts once it reconnects")
+            self.build_read_batches()
+            return
+
+        channels = {}
+        for name, (dev, ain) in {**system_config.PRESSURE_MAP, **system_config.THRUST_MAP}.items():
+            if dev == "T7":
+                channels[name] = ain
+
+        self.sync_clock("T7") # Fresh fit to stamp the stream start with
+        self.stream = LabJackStream(self.devices["T7"].handle, channels, scan_rate,
+                                    ljm_module=self.ljm, clock=self.clocks["T7"])
+        self.stream.on_read.append(lambda: self.heartbeat("T7_STREAM"))
+        self.stream.on_error.append(lambda e: self.connections.device_lost("T7", e))
+        self.stream.start()
+        self.build_read_batches() # Streamed channels drop out of the command-response batch
+
+    def stop_stream(self):
+        self.stream_wanted = False
+        if self.stream:
+            self.stream.stop()
+            self.stream = None
+            self.build_read_batches()
+
+    def stream_stats(self):
+        # Device and host backlog for the running stream (None if not streaming)
+        return self.stream.stats() if self.stream else None
 
     # READ ANALOG (returns full merged dict)
     def read_analog(self):
+        return self._read_batches(self.read_batches, self.stream.names if self.stream else [])[1]
+
+    def read_channels(self, names):
+        return self.read_channels_timed(names)[1]
+
+    def read_channels_timed(self, names):
+        # Only the given channels, e.g. one rate group of MultiRateDaq -> (host time, values).
+        # The time comes from the device's own CORE_TIMER, so keep a group on one device
+        wanted = set(names)
+        streamed = [name for name in self.stream.names if name in wanted] if self.stream else []
+        return self._read_batches(self.batches_for(wanted), streamed)
+
+    def _read_batches(self, batches, streamed):
         data = {}
+        times = []
+        stream = self.stream # Can be swapped by a reconnect
+        if streamed:
+            # Dead stream -> NaN, not its last values
+            latest = stream.latest() if stream and stream.running else {}
+            data = {name: latest.get(name, np.nan) for name in streamed}
+
+        # Devices polled at once, each in a single round trip
+        if len(batches) == 1:
+            (dev, batch), = batches.items()
+            results = [self._read_device(dev, *batch)]
+        else:
+            futures = [self.pool.submit(self._read_device, dev, *batch) for dev, batch in batches.items()]
+            results = [future.result() for future in futures]
+
+        for t, values in results:
+            data.update(values)
+            if t is not None:
+                times.append(t)
+
+        t = float(np.mean(times)) if times else time.monotonic()
+        return t, data
+
+    def _read_device(self, dev, names, registers):
+        device = self.devices[dev]
+
+        # Gap while the device is down, the rest keeps acquiring
+        if not device.connected:
+            return None, dict.fromkeys(names, np.nan)
+
+        # CORE_TIMER rides along in the same round trip
+        t_send = time.monotonic()
+        try:
+            values = self.ljm.eReadNames(device.handle, len(registers) + 1, registers + ["CORE_TIMER"])
+        except self.ljm.LJMError as e:
+            self.connections.device_lost(dev, e)
+            return None, dict.fromkeys(names, np.nan)
+        t_recv = time.monotonic()
+        latency = t_recv - t_send
+
+        self.read_latency[dev] = latency
+        self.max_read_latency[dev] = max(self.max_read_latency[dev], latency)
+        self.heartbeat(dev)
 
-        # ---- PRESSURES (T7) ----
-        for name, (dev, ain) in system_config.PRESSURE_MAP.items():
-            value = ljm.eReadName(self.devices[dev].handle, ain)
-            data[name] = value
+        clock = self.clocks[dev]
+        t = clock.to_host(clock.add(values[-1], t_send, t_recv))
+        return float(t), dict(zip(names, values[:-1]))
 
-        # ---- TEMPS (T7_PRO) ----
-        for name, (dev, ain) in system_config.TEMP_MAP.items():
-            value = ljm.eReadName(self.devices[dev].handle, ain)
-            data[name] = value
+    # CLOCK SYNC
+    def sync_clock(self, dev):
+        device = self.devices[dev]
+        if not device.connected:
+            return
+        t_send = time.monotonic()
+        try:
+            ticks = self.ljm.eReadName(device.handle, "CORE_TIMER")
+        except self.ljm.LJMError as e:
+            self.connections.device_lost(dev, e)
+            return
+        self.clocks[dev].add(ticks, t_send, time.monotonic())
+
+    def _sync_loop(self):
+        interval = system_config.CLOCK_SYNC_INTERVAL_S
+        while not self.sync_stop.wait(interval):
+            for dev, clock in self.clocks.items():
+                if time.monotonic() - clock.last_update > interval:
+                    self.sync_clock(dev)
+
+    def clock_stats(self):
+        # Per-device offset/drift against the host clock
+        return {dev: clock.stats() for dev, clock in self.clocks.items()}
+
+    # CONNECTION EVENTS (called from the connection manager's threads)
+    def _device_lost(self, dev):
+        self.event(f"{dev} DISCONNECTED")
+
+    def _device_reconnected(self, dev):
+        self.event(f"{dev} RECONNECTED")
+        self.clocks[dev].reset() # Possibly power cycled, CORE_TIMER starts over
+        # DIO lines came back as inputs, let the owner put its valves back first
+        for callback in self.on_reconnect:
+            callback(dev)
+        # Stream died with the old handle, start it again on the new one
+        if dev == "T7" and self.stream_wanted:
+            old, self.stream = self.stream, None
+            if old:
+                old.stop()
+            self.start_stream()
 
-        # ---- THRUST (T7) ----
-        for name, (dev, ain) in system_config.THRUST_MAP.items():
-            value = ljm.eReadName(self.devices[dev].handle, ain)
-            data[name] = value
+    def event(self, name):
+        t = time.monotonic()
+        for callback in self.on_event:
+            callback(name, t)
 
-        return data
+    def heartbeat(self, source):
+        for callback in self.on_heartbeat:
+            callback(source)
+
+    def heartbeat_sources(self):
+        # Every device polled, plus the stream thread if running
+        return list(self.read_batches) + (["T7_STREAM"] if self.stream else [])
+
+    def read_latency_ms(self):
+        # Per-device (last, max) read latency so a slow unit stands out
+        return {
+            dev: (self.read_latency[dev] * 1000, self.max_read_latency[dev] * 1000)
+            for dev in self.devices
+        }
     
     # Digital write for valves (T7 only)
     def set_digital(self, name, state: bool):
+        self.set_digital_many({name: state})
 
-        if name not in system_config.VALVE_DIO_MAP:
-            print(f"Unknown valve: {name}")
-            return
-
-        dev, dio = system_config.VALVE_DIO_MAP[name]
+    def set_digital_many(self, states):
+        # {valve: state} -> one eWriteNames per device.
+        # Returns {device: error} for devices the write didn't reach
+        failed = {}
+        per_device = {}
+        for name, state in states.items():
+            if name not in system_config.VALVE_DIO_MAP:
+                print(f"Unknown valve: {name}")
+                continue
+            dev, dio = system_config.VALVE_DIO_MAP[name]
+            per_device.setdefault(dev, {})[dio] = state
 
-        ljm.eWriteName(self.devices[dev].handle, f"{dio}_DIRECTION", 1)
-        ljm.eWriteName(self.devices[dev].handle, dio, int(state))
+        for dev, dio_states in per_device.items():
+            device = self.devices[dev]
+            if not device.connected:
+                print(f"{dev} not connected, valve write skipped: {dio_states}")
+                failed[dev] = "not connected"
+                continue
+            try:
+                device.write_digital(dio_states)
+            except self.ljm.LJMError as e:
+                print(f"{dev} valve write failed: {e}")
+                failed[dev] = str(e)
+                self.connections.device_lost(dev, e)
 
+        return failed
 
     def close(self):
-        for dev in self.devices.values():
-            ljm.close(dev.handle)
-        print("All LabJacks closed.")
\ No newline at end of file
+        self.sync_stop.set()
+        self.sync_thread.join()
+        self.stop_stream()
+        self.pool.shutdown()
+        self.connections.close()
+        print("All LabJacks closed.")
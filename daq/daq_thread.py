@@ -1,21 +1,101 @@
 from PyQt6.QtCore import QThread, pyqtSignal
+import numpy as np
 import time
+from daq.channels import CHANNELS, CHANNEL_INDEX
+from daq.sample_block import SampleBlock
 
 class DAQ_Thread(QThread):
-    data_ready = pyqtSignal(dict)
+    data_ready = pyqtSignal(dict) # Non-block mode with no consumers/calibration/filters only
+    block_ready = pyqtSignal(object) # SampleBlock
 
-    def __init__(self, daq, interval_ms=100):
+    def __init__(self, daq, interval_ms=100, block_size=None, block_latency_ms=None, calibration=None, filters=None):
         super().__init__()
         self.daq = daq
+        self.calibration = calibration # Volts -> engineering units before anyone sees the block
+        self.filters = filters # FilterBank, fills block.filtered (state lives on this thread)
         self.interval = interval_ms / 1000
         self.running = True
 
+        # Called with every SampleBlock on this thread before it is emitted
+        # (e.g. the safety thread's queue), so they don't wait on the GUI
+        self.consumers = []
+
+        # Block mode: collect samples and emit one SampleBlock when either
+        # block_size samples are in or block_latency_ms has passed
+        self.block_mode = block_size is not None or block_latency_ms is not None
+        self.block_size = block_size or 1
+        self.block_latency = (block_latency_ms or float("inf")) / 1000
+
     def run(self):
+        if self.block_mode:
+            self.run_blocks()
+            return
+
         while self.running:
             data = self.daq.read_analog()
-            self.data_ready.emit(data)
+            if self.consumers or self.calibration or self.filters:
+                # Same path as block mode with one-sample blocks, so the calibrated
+                # and filtered block is what gets emitted (on block_ready)
+                block = SampleBlock.from_dict(time.monotonic(), data)
+                block.stamps["read"] = time.monotonic_ns()
+                self.emit_block(block)
+            else:
+                self.data_ready.emit(data)
             time.sleep(self.interval)
 
+    def run_blocks(self):
+        # Backends that produce their own blocks (ReplayDaq, simulator) pace themselves
+        if getattr(self.daq, "produces_blocks", False):
+            while self.running:
+                block = self.daq.read_block()
+                if block is None:
+                    time.sleep(self.interval)
+                    continue
+                block.stamps["read"] = time.monotonic_ns()
+                self.emit_block(block)
+            return
+
+        n_ch = len(CHANNELS)
+
+        while self.running:
+            t = np.empty(self.block_size)
+            data = np.full((n_ch, self.block_size), np.nan)
+            n = 0
+            deadline = time.monotonic() + self.block_latency
+
+            while self.running:
+                values = self.daq.read_analog()
+                read_ns = time.monotonic_ns()
+                t[n] = read_ns / 1e9
+                for name, value in values.items():
+                    i = CHANNEL_INDEX.get(name)
+                    if i is not None:
+                        data[i, n] = value
+                n += 1
+
+                # Emit now rather than sleep past the latency target
+                if n >= self.block_size or time.monotonic() + self.interval > deadline:
+                    break
+                time.sleep(self.interval)
+
+            block = SampleBlock(t[:n], data[:, :n])
+            block.stamps["read"] = read_ns
+            self.emit_block(block)
+            time.sleep(self.interval)
+
+    def add_consumer(self, callback):
+        self.consumers.append(callback)
+
+    def emit_block(self, block):
+        if self.calibration:
+            self.calibration.process(block)
+        if self.filters:
+            block.filtered = self.filters.process(block.t, block.data)
+        for consumer in self.consumers:
+            consumer(block)
+        block.stamps["emit"] = time.monotonic_ns()
+        self.block_ready.emit(block)
+
     def stop(self):
         self.running = False
         self.wait()
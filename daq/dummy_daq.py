@@ -1,14 +1,45 @@
 import random 
 import config.system_config as system_config
 import time
+from daq.channels import CHANNELS
+from daq.sample_block import SampleBlock
+from daq.signal_generator import SignalGenerator
  
 class DummyDaq: 
     """Simulates sensors and valves.""" 
-    def __init__(self): 
+    def __init__(self, rate_hz=None, seed=None, profiles=None, realtime=True, block_size=None): 
         self.valves = {v: False for v in system_config.VALVES} 
         self.ignition = {"Ignition": False} 
+
+        # Simulator mode: rate_hz given -> whole blocks from a seeded SignalGenerator
+        # (realtime=False generates as fast as the pipeline can take it)
+        if rate_hz is not None and rate_hz <= 0:
+            raise ValueError(f"rate_hz must be positive, got {rate_hz}")
+        self.produces_blocks = rate_hz is not None
+        self.generator = None
+        if self.produces_blocks:
+            self.generator = SignalGenerator(rate_hz, self.default_profiles(profiles), seed)
+            self.realtime = realtime
+            self.block_size = block_size or max(1, int(rate_hz * system_config.DAQ_BLOCK_LATENCY_MS / 1000))
+            self.start = None
+
+    @staticmethod
+    def default_profiles(profiles):
+        # Same ranges as the random dummy values, overridden per channel
+        result = {}
+        for ch in system_config.PRESSURE_CHANNELS:
+            result[ch] = {"base": 305, "noise": 3}
+        for ch in system_config.TEMP_CHANNELS:
+            result[ch] = {"base": 22.5, "noise": 1.5}
+        result["thrust"] = {"base": 17.5, "noise": 1.5}
+        result.update(profiles or {})
+        return result
         
     def read_analog(self): 
+        if self.generator:
+            t, data = self.generator.generate(1)
+            return dict(zip(CHANNELS, data[:, 0].tolist()))
+
         data = {}
         
         # Generate 'dummy' values
@@ -22,9 +53,31 @@ class DummyDaq:
 
         return data
 
+    def read_channels(self, names):
+        data = self.read_analog()
+        return {name: data[name] for name in names if name in data}
+
+    def read_block(self):
+        if self.start is None:
+            self.start = time.monotonic()
+
+        # Real time: wait until this block's last sample is 'due'
+        if self.realtime:
+            due = self.start + (self.generator.n + self.block_size) / self.generator.rate
+            delay = due - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+        t, data = self.generator.generate(self.block_size)
+        return SampleBlock(self.start + t, data)
+
     def set_digital(self, name, state: bool): 
         if name in self.valves: 
             self.valves[name] = state 
             print(f"[DUMMY] {name} valve -> {'OPEN' if state else 'CLOSED'}") 
         else: 
-            print(f"[DUMMY] Unknown valve: {name}") 
\ No newline at end of file
+            print(f"[DUMMY] Unknown valve: {name}") 
+
+    def set_digital_many(self, states):
+        for name, state in states.items():
+            self.set_digital(name, state)
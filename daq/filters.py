@@ -0,0 +1,186 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+import config.system_config as system_config
+from daq.channels import CHANNEL_INDEX
+
+# Streaming per-channel filters over SampleBlocks, state carried between blocks.
+# FILTERS maps channel -> one stage or a list of stages applied in order:
+#   {"type": "iir", "cutoff_hz": 20}             one-pole low-pass
+#   {"type": "moving_average", "window": 10}     mean of the last N samples
+#   {"type": "median", "window": 5}              median of the last N (spike rejection)
+# Channels sharing a stage type/parameter are filtered together as one
+# (rows x n) array. NaN gaps are bridged with the last good value (or, with no
+# earlier value, the block's first good one) so they don't poison the filter
+# state, and put back as NaN in the output.
+
+IIR_CHUNK_DECAY = 20.0 # Max exponent per closed-form IIR chunk, keeps exp(+-w*n) in range
+
+
+class OnePole:
+    # y[n] = b*y[n-1] + (1-b)*x[n], b = exp(-2*pi*fc*dt), solved a chunk at a time:
+    # y[j] = b^(j+1)*y0 + (1-b)*b^j*cumsum(x[i]*b^-i)
+    def __init__(self, cutoff_hz):
+        self.cutoff = np.asarray(cutoff_hz, dtype=float)[:, None]
+        self.y = None
+
+    def process(self, x, dt):
+        if self.y is None:
+            self.y = x[:, :1].copy()
+        self.y = np.where(np.isnan(self.y), x[:, :1], self.y) # Rows with no data yet
+
+        w = 2 * np.pi * self.cutoff * dt
+        b = np.exp(-w)
+        out = np.empty_like(x)
+        step = max(1, int(IIR_CHUNK_DECAY / w.max()))
+
+        for s in range(0, x.shape[1], step):
+            xs = x[:, s:s + step]
+            decay = np.exp(-w * np.arange(xs.shape[1]))
+            ys = decay * (b * self.y + (1 - b) * np.cumsum(xs / decay, axis=1))
+            out[:, s:s + step] = ys
+            self.y = ys[:, -1:]
+        return out
+
+
+class MovingAverage:
+    def __init__(self, window):
+        self.window = window
+        self.tail = None # Last window-1 inputs
+
+    def process(self, x, dt):
+        if self.tail is None:
+            self.tail = np.full((len(x), self.window - 1), np.nan)
+        self.tail = np.where(np.isnan(self.tail), x[:, :1], self.tail) # Rows with no data yet
+        buf = np.hstack((self.tail, x))
+        c = np.cumsum(np.hstack((np.zeros((len(buf), 1)), buf)), axis=1)
+        self.tail = buf[:, buf.shape[1] - (self.window - 1):]
+        return (c[:, self.window:] - c[:, :-self.window]) / self.window
+
+
+class MedianFilter:
+    def __init__(self, window):
+        self.window = window
+        self.tail = None
+
+    def process(self, x, dt):
+        if self.tail is None:
+            self.tail = np.full((len(x), self.window - 1), np.nan)
+        self.tail = np.where(np.isnan(self.tail), x[:, :1], self.tail)
+        buf = np.hstack((self.tail, x))
+        self.tail = buf[:, buf.shape[1] - (self.window - 1):]
+        return np.median(sliding_window_view(buf, self.window, axis=1), axis=-1)
+
+
+class FilterBank:
+    def __init__(self, definitions=None):
+        definitions = system_config.FILTERS if definitions is None else definitions
+
+        stages = {} # (row, stage definition) per stage depth
+        for ch, cfg in definitions.items():
+            if ch not in CHANNEL_INDEX:
+                continue
+            for depth, stage in enumerate(cfg if isinstance(cfg, list) else [cfg]):
+                if stage["type"] not in ("iir", "moving_average", "median"):
+                    raise ValueError(f"{ch}: unknown filter type {stage['type']}")
+                stages.setdefault(depth, []).append((CHANNEL_INDEX[ch], stage))
+
+        self.rows = sorted({row for entries in stages.values() for row, _ in entries})
+        local = {row: i for i, row in enumerate(self.rows)}
+
+        # Per depth: [(positions in self.rows, filter)], same kind/parameter grouped
+        self.passes = []
+        for depth in sorted(stages):
+            groups = {}
+            for row, stage in stages[depth]:
+                kind = stage["type"]
+                key = (kind,) if kind == "iir" else (kind, int(stage["window"]))
+                groups.setdefault(key, []).append((local[row], stage))
+
+            filters = []
+            for key, entries in groups.items():
+                positions = np.array([i for i, _ in entries])
+                if key[0] == "iir":
+                    filters.append((positions, OnePole([stage["cutoff_hz"] for _, stage in entries])))
+                elif key[0] == "moving_average":
+                    filters.append((positions, MovingAverage(key[1])))
+                else:
+                    filters.append((positions, MedianFilter(key[1])))
+            self.passes.append(filters)
+
+        self.last = np.full((len(self.rows), 1), np.nan) # Last good input per row
+        self.t_last = None
+        self.dt = None
+
+    def _dt(self, t):
+        # Sample interval from the block's own timestamps
+        if len(t) > 1:
+            self.dt = (t[-1] - t[0]) / (len(t) - 1)
+        elif self.t_last is not None and t[0] > self.t_last:
+            self.dt = t[0] - self.t_last
+        self.t_last = t[-1]
+        return self.dt or 1e-3
+
+    def process(self, t, data):
+        # (channels x n) -> filtered copy, unfiltered channels passed through
+        out = data.copy()
+        if not self.rows or len(t) == 0:
+            return out
+        dt = self._dt(t)
+
+        x = data[self.rows]
+        gaps = np.isnan(x)
+        if gaps.any():
+            # Forward fill from the last good value (carried from earlier blocks)
+            idx = np.where(gaps, -1, np.arange(x.shape[1]))
+            np.maximum.accumulate(idx, axis=1, out=idx)
+            x = np.take_along_axis(np.hstack((self.last, x)), idx + 1, axis=1)
+
+            # Still NaN = leading gap with nothing earlier, back fill from the first good sample
+            lead = np.isnan(x)
+            if lead.any():
+                first = x[np.arange(len(x)), np.argmax(~lead, axis=1)]
+                x = np.where(lead, first[:, None], x)
+        self.last = x[:, -1:].copy()
+
+        for filters in self.passes:
+            y = x.copy()
+            for positions, f in filters:
+                y[positions] = f.process(x[positions], dt)
+            x = y
+
+        x[gaps] = np.nan
+        out[self.rows] = x
+        return out
+
+
+class Decimator:
+    # Min and max of each channel over every `factor` samples (earlier one first),
+    # stamped with the bin's first and last times, so spikes on unfiltered channels
+    # survive like in the renderer's decimate_minmax. Partial bins carry over.
+    def __init__(self, factor):
+        self.factor = max(1, int(factor))
+        self.t_pending = np.empty(0)
+        self.pending = None
+
+    def process(self, t, data):
+        if self.factor == 1:
+            return t, data
+        if self.pending is not None:
+            t = np.concatenate((self.t_pending, t))
+            data = np.hstack((self.pending, data))
+
+        f = self.factor
+        n_bins = len(t) // f
+        used = n_bins * f
+        self.t_pending, self.pending = t[used:], data[:, used:]
+
+        yb = data[:, :used].reshape(len(data), n_bins, f)
+        nan = np.isnan(yb) # All-NaN bins come out NaN
+        i_min = np.argmin(np.where(nan, np.inf, yb), axis=2)
+        i_max = np.argmax(np.where(nan, -np.inf, yb), axis=2)
+
+        idx = np.stack((np.minimum(i_min, i_max), np.maximum(i_min, i_max)), axis=2)
+        values = np.take_along_axis(yb, idx, axis=2).reshape(len(data), 2 * n_bins)
+        tb = t[:used].reshape(n_bins, f)
+        times = np.stack((tb[:, 0], tb[:, -1]), axis=1).reshape(-1)
+        return times, values
@@ -1,58 +1,82 @@
+import threading
 import time
+from itertools import groupby
 from PyQt6.QtCore import QThread, pyqtSignal
+import config.system_config as system_config
+
+# The hot fire sequence is compiled into absolute deadlines on the monotonic
+# clock (start + offset from IGNITION_SEQUENCE), so one late step doesn't push
+# the rest back. Each wait sleeps on an Event that abort() sets, then spins for
+# the last IGNITION_SPIN_S to hit the deadline, checking abort the whole time.
 
 class IgnitionSequence(QThread):
     # Step signal is (valve_name, state)
     step_signal = pyqtSignal(str, bool)
     finished_signal = pyqtSignal()
     aborted_signal = pyqtSignal()
+    timing_signal = pyqtSignal(object) # List of step timings, sent after the run either way
 
-    def __init__(self, daq):
+    def __init__(self, daq, sequence=None):
         super().__init__()
         self.daq = daq
-        self._abort = False
+        self.sequence = sorted(sequence or system_config.IGNITION_SEQUENCE, key=lambda step: step[0])
+        self._abort = threading.Event()
+
+        # Scheduled vs actual actuation for each step that ran
+        self.start_ns = None
+        self.timings = []
 
     def abort(self):
-        self._abort = True
+        self._abort.set()
 
-    # ----- HOT FIRE SEQUENCE -----    
+    # ----- HOT FIRE SEQUENCE -----
     def run(self):
         try:
             self.step_signal.emit("SEQUENCE", True)
-            # Step 0: Close Vent Valve
-            self._set_valve("Vent", False)
-            self._delay(5.0) # Could maybe ask for manual input here. Say if want to wait for N2O to pressurise 
 
-            # Step 1: Igniter ON
-            self._set_valve("Ignition", True)
-            self._delay(3.0)
+            self.start_ns = time.monotonic_ns()
+            # Steps at the same offset go out as one write
+            for offset, steps in groupby(self.sequence, key=lambda step: step[0]):
+                self._wait_until(self.start_ns + int(offset * 1e9))
+                self._set_valves({valve: state for _, valve, state in steps}, offset)
 
-            # Step 2: Main valve OPEN
-            self._set_valve("MOV", True)
-            self._delay(0.5)
-
-            # Step 3: Igniter OFF
-            self._set_valve("Ignition", False)
-            
             self.finished_signal.emit()
 
         except RuntimeError:
             self.aborted_signal.emit()
-    
+
+        self.timing_signal.emit(self.timings)
+
     # HELPERS
-    def _delay(self, seconds):
-        t0 = time.time()
-        while time.time() - t0 < seconds:
-            if self._abort:
+    def _wait_until(self, deadline_ns):
+        spin_ns = int(system_config.IGNITION_SPIN_S * 1e9)
+
+        # Sleep until just before the deadline, woken straight away by abort()
+        remaining = deadline_ns - time.monotonic_ns()
+        if remaining > spin_ns and self._abort.wait((remaining - spin_ns) / 1e9):
+            raise RuntimeError("IGNITION ABORTED")
+
+        # Spin the rest
+        while time.monotonic_ns() < deadline_ns:
+            if self._abort.is_set():
                 raise RuntimeError("IGNITION ABORTED")
-            time.sleep(0.05)
 
-    def _set_valve(self, name, state):
-        if self._abort:
+    def _set_valves(self, states, offset):
+        if self._abort.is_set():
             raise RuntimeError("IGNITION ABORTED")
 
-        self.daq.set_digital(name, state)
-        self.step_signal.emit(name, state)
+        sent_ns = time.monotonic_ns()
+        self.daq.set_digital_many(states)
+        done_ns = time.monotonic_ns()
 
-    def _step(self, name, state):
-        self.step_signal.emit(name, state)
\ No newline at end of file
+        for name, state in states.items():
+            self.timings.append({
+                "valve": name,
+                "state": state,
+                "scheduled_s": offset,
+                "actual_s": (sent_ns - self.start_ns) / 1e9,
+                "late_ms": (sent_ns - self.start_ns) / 1e6 - offset * 1e3,
+                "command_ms": (done_ns - sent_ns) / 1e6, # How long the DAQ write took
+                "sent_ns": sent_ns,
+            })
+            self.step_signal.emit(name, state)
@@ -1,10 +1,12 @@
 from labjack import ljm 
 import config.system_config as system_config
+from daq.labjack_device import thermocouple_registers, read_register
 
 # aims to mirror dummy_daq.py
 # will probably need to change config to fit with AINX/DIOX/EIOX
 
 class LabJackDaq:
+    returns_raw = True # AIN volts, see daq/calibration.py
     
     def __init__(self, ip=None):
 
@@ -16,54 +18,80 @@ class LabJackDaq:
 
         print("LabJack connected.")
 
-        # Configure AIN ranges once at startup
-        for ch in system_config.PRESSURE_CHANNELS + system_config.TEMP_CHANNELS:
-            ljm.eWriteName(self.handle, f"{ch}_RANGE", 10)
-            ljm.eWriteName(self.handle, f"{ch}_RESOLUTION_INDEX", 1)
+        # Channel name -> AIN, pressures/temps/thrust (which T7 in the map is ignored)
+        ains = {
+            name: ain
+            for channel_map in (system_config.PRESSURE_MAP, system_config.TEMP_MAP, system_config.THRUST_MAP)
+            for name, (_, ain) in channel_map.items()
+        }
+
+        # Configure AIN ranges (and on-device thermocouples) once at startup, one eWriteNames
+        names, values = [], []
+        for name, ain in ains.items():
+            if name in system_config.THERMOCOUPLE_EF:
+                tc_names, tc_values = thermocouple_registers(ain, system_config.THERMOCOUPLE_EF[name])
+                names += tc_names
+                values += tc_values
+            else:
+                names += [f"{ain}_RANGE", f"{ain}_RESOLUTION_INDEX"]
+                values += [10, 1]
+        ljm.eWriteNames(self.handle, len(names), names, values)
 
         # Track valves
         self.valve_states = {v: False for v in system_config.VALVES}
+        self.dio_output = set() # DIO lines already set as outputs
+
+        # Channel name -> register read (thermocouples come back converted from _EF_READ_A)
+        self.channel_map = {name: read_register(name, ain) for name, ain in ains.items()}
 
 
     # Read analog (gui expects dict)
 
     def read_analog(self):
-        data = {}
-
-        # Pressures
-        for name, ain in system_config.PRESSURE_MAP.items():
-            value = ljm.eReadName(self.handle, ain)
-            data[name] = value
-
-        # Temperatures
-        for name, ain in system_config.TEMP_MAP.items():
-            value = ljm.eReadName(self.handle, ain)
-            data[name] = value
-
-        # Thrust (TBC)
-        for name, ain in system_config.THRUST_MAP.items():
-            value = ljm.eReadName(self.handle, ain)
-            data[name] = value
-
-        return data
+        return self.read_channels(list(self.channel_map))
+
+    def read_channels(self, names):
+        # Single device, every channel in one eReadNames
+        names = [name for name in names if name in self.channel_map]
+        if not names:
+            return {}
+        registers = [self.channel_map[name] for name in names]
+        values = ljm.eReadNames(self.handle, len(registers), registers)
+        return dict(zip(names, values))
     
     # Digital write (gui uses valve names)
     
     def set_digital(self, name, state: bool):
-        # Map names to DIO/EIO channels
+        self.set_digital_many({name: state})
+
+    def set_digital_many(self, states):
+        # Map names to DIO/EIO channels, all written in one eWriteNames
         # EXAMPLEEEEEEE !!!
-        if name not in system_config.VALVE_DIO_MAP:
-            print(f"Unknown valve: {name}")
+        names, values = [], []
+        for name, state in states.items():
+            if name not in system_config.VALVE_DIO_MAP:
+                print(f"Unknown valve: {name}")
+                continue
+
+            _, dio = system_config.VALVE_DIO_MAP[name] # Single device, ignore which T7
+
+            # Direction only needs writing the first time
+            if dio not in self.dio_output:
+                names.append(f"{dio}_DIRECTION")
+                values.append(1)
+            names.append(dio)
+            values.append(int(state))
+
+        if not names:
             return
 
-        dio = system_config.VALVE_DIO_MAP[name]
-
-        ljm.eWriteName(self.handle, f"{dio}_DIRECTION", 1)
-        ljm.eWriteName(self.handle, dio, int(state))
-
-        self.valve_states[name] = state
+        ljm.eWriteNames(self.handle, len(names), names, values)
 
-        print(f"{name} -> {'OPEN' if state else 'CLOSED'}")
+        for name, state in states.items():
+            if name in system_config.VALVE_DIO_MAP:
+                self.dio_output.add(system_config.VALVE_DIO_MAP[name][1])
+                self.valve_states[name] = state
+                print(f"{name} -> {'OPEN' if state else 'CLOSED'}")
 
     def close(self):
         ljm.close(self.handle)
@@ -1,9 +1,114 @@
-from labjack import ljm
+try:
+    from labjack import ljm
+except ImportError: # Only needed against real hardware, a fake can be passed as ljm_module
+    ljm = None
 import threading
 import time
+import config.system_config as system_config
+
+# AIN extended feature index per thermocouple type, and EF_CONFIG_A unit codes
+TC_EF_INDEX = {"E": 20, "J": 21, "K": 22, "R": 23, "T": 24, "S": 25, "N": 27, "B": 28, "C": 30}
+EF_UNITS = {"K": 0, "C": 1, "F": 2}
+
+
+def thermocouple_registers(ain, tc):
+    # Writes that turn `ain` into a thermocouple input, converted on the device
+    if tc["tc_type"] not in TC_EF_INDEX:
+        raise ValueError(f"{ain}: unsupported thermocouple type {tc['tc_type']}")
+    cjc = {**system_config.THERMOCOUPLE_CJC, **tc.get("cjc", {})}
+    names = [
+        f"{ain}_RANGE", f"{ain}_RESOLUTION_INDEX",
+        f"{ain}_EF_INDEX", f"{ain}_EF_INDEX", # Cleared first, setting an index resets its config
+        f"{ain}_EF_CONFIG_A", f"{ain}_EF_CONFIG_B", f"{ain}_EF_CONFIG_D", f"{ain}_EF_CONFIG_E",
+    ]
+    values = [
+        0.1, 1, # Thermocouple mV fit well inside +-0.1 V
+        0, TC_EF_INDEX[tc["tc_type"]],
+        EF_UNITS[system_config.THERMOCOUPLE_UNITS], cjc["address"], cjc["slope"], cjc["offset"],
+    ]
+    return names, values
+
+
+def read_register(name, ain):
+    # Register holding channel `name`: the converted value for on-device thermocouples
+    return f"{ain}_EF_READ_A" if name in system_config.THERMOCOUPLE_EF else ain
+
 
 class LabJackDevice:
-    def __init__(self, ip, name):
+    # ljm_module can be swapped for a mock with the same functions
+    def __init__(self, ip, name, ljm_module=None, connect=True):
+        self.ip = ip
         self.name = name
-        self.handle = ljm.openS("T7", "ETHERNET", ip)
-        print(f"{name} connected.")
\ No newline at end of file
+        self.ljm = ljm_module or ljm
+        if self.ljm is None:
+            raise ImportError("labjack-ljm is not installed (pip install labjack-ljm)")
+        self.handle = None
+        self.connected = False
+
+        # Last written DIO direction/state, so lines already set as outputs
+        # don't get their _DIRECTION rewritten on every valve change
+        self.dio_output = set()
+        self.dio_state = {}
+        self.dio_lock = threading.Lock()
+
+        if connect:
+            self.open()
+            self.configure()
+
+    def open(self):
+        self.handle = self.ljm.openS("T7", "ETHERNET", self.ip)
+        with self.dio_lock:
+            self.dio_output = set() # Device may have power cycled, lines back to inputs
+        self.connected = True
+        print(f"{self.name} connected.")
+
+    def configure(self):
+        # Channel setup for every AIN on this device (thermocouple EF included), in one eWriteNames.
+        # Re-run after every (re)connect
+        names, values = [], []
+        for channel_map in (system_config.PRESSURE_MAP, system_config.TEMP_MAP, system_config.THRUST_MAP):
+            for name, (dev, ain) in channel_map.items():
+                if dev != self.name:
+                    continue
+                if name in system_config.THERMOCOUPLE_EF:
+                    tc_names, tc_values = thermocouple_registers(ain, system_config.THERMOCOUPLE_EF[name])
+                    names += tc_names
+                    values += tc_values
+                else:
+                    names += [f"{ain}_RANGE", f"{ain}_RESOLUTION_INDEX"]
+                    values += [10, 1]
+
+        if names:
+            self.ljm.eWriteNames(self.handle, len(names), names, values)
+
+    def mark_lost(self):
+        # Handle is dead, drop it so nothing else uses it
+        self.connected = False
+        handle, self.handle = self.handle, None
+        if handle is not None:
+            try:
+                self.ljm.close(handle)
+            except self.ljm.LJMError:
+                pass
+
+    def close(self):
+        if self.handle is not None:
+            self.ljm.close(self.handle)
+            self.handle = None
+        self.connected = False
+
+    def write_digital(self, states):
+        # {dio: bool} -> one eWriteNames, direction only for lines not yet outputs
+        with self.dio_lock:
+            names, values = [], []
+            for dio, state in states.items():
+                if dio not in self.dio_output:
+                    names.append(f"{dio}_DIRECTION")
+                    values.append(1)
+                names.append(dio)
+                values.append(int(state))
+
+            self.ljm.eWriteNames(self.handle, len(names), names, values)
+
+            self.dio_output.update(states)
+            self.dio_state.update(states)
@@ -0,0 +1,142 @@
+try:
+    from labjack import ljm
+except ImportError: # Only needed against real hardware, a fake can be passed as ljm_module
+    ljm = None
+import numpy as np
+import threading
+import time
+import config.system_config as system_config
+from daq.stream_buffer import RingBuffer
+
+# Hardware-timed LJM stream for the fast T7 channels (pressures + load cell).
+# The T7 clocks every scan itself, so sample spacing is set by the device
+# and not by Ethernet round trips. A reader thread pulls scan blocks off the
+# stream and writes them straight into a RingBuffer.
+
+# LJM fills scans the device had to skip with this value
+SKIPPED_SAMPLE = -9999.0
+
+
+class LabJackStream:
+    def __init__(self, handle, channels, scan_rate=None, scans_per_read=None, buffer_size=None, ljm_module=None, clock=None):
+        self.ljm = ljm_module or ljm
+        self.clock = clock # ClockSync for this device, to stamp scans on the device clock
+        self.start_device_s = None
+        # channels: {name: "AINx"} in scan order
+        self.handle = handle
+        self.names = list(channels.keys())
+        self.ains = list(channels.values())
+
+        self.scan_rate = scan_rate or system_config.STREAM_SCAN_RATE_HZ
+        self.scans_per_read = scans_per_read or system_config.STREAM_SCANS_PER_READ
+        buffer_size = buffer_size or system_config.STREAM_BUFFER_SIZE
+
+        self.buffer = RingBuffer(self.names, buffer_size) # Scan times are host monotonic s
+
+        # Backlog/health counters
+        self.device_backlog = 0 # Scans waiting in the T7's stream buffer
+        self.ljm_backlog = 0    # Scans waiting in LJM's host-side buffer
+        self.scan_count = 0
+        self.skipped_scans = 0
+
+        self.running = False
+        self.started = False
+        self.thread = None
+        self.on_read = [] # Called on the stream thread after every eStreamRead
+        self.on_error = [] # Called with the LJMError if the stream dies
+
+    def start(self):
+        # Stream config: internal clock, no trigger, default settling/resolution
+        self.ljm.eWriteName(self.handle, "STREAM_TRIGGER_INDEX", 0)
+        self.ljm.eWriteName(self.handle, "STREAM_CLOCK_SOURCE", 0)
+        self.ljm.eWriteName(self.handle, "STREAM_SETTLING_US", 0)
+        self.ljm.eWriteName(self.handle, "STREAM_RESOLUTION_INDEX", 0)
+        self.ljm.eWriteName(self.handle, "AIN_ALL_NEGATIVE_CH", self.ljm.constants.GND)
+
+        addresses = self.ljm.namesToAddresses(len(self.ains), self.ains)[0]
+        self.scan_rate = self.ljm.eStreamStart(
+            self.handle, self.scans_per_read, len(addresses), addresses, self.scan_rate
+        )
+        # Scan n was taken at start_time + n / scan_rate (device clocked)
+        self.start_time = time.monotonic()
+
+        # Better: the device's own CORE_TIMER at stream start, mapped through the clock fit
+        if self.clock:
+            try:
+                ticks = self.ljm.eReadName(self.handle, "STREAM_START_TIME_STAMP")
+                self.start_device_s = self.clock.device_seconds(ticks)
+            except self.ljm.LJMError as e:
+                print("No stream start time stamp, using host time:", e)
+        print(f"Stream started: {len(self.ains)} channels @ {self.scan_rate:.0f} Hz")
+
+        self.running = True
+        self.started = True # Until stop(), even if the read loop dies on an error
+        self.thread = threading.Thread(target=self._read_loop, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        # `running` also drops when the read loop hits an error, the stream
+        # still needs eStreamStop and the thread joining then
+        if not self.started:
+            return
+        self.started = False
+        self.running = False
+        if self.thread and self.thread is not threading.current_thread():
+            self.thread.join()
+        try:
+            self.ljm.eStreamStop(self.handle)
+        except self.ljm.LJMError as e:
+            print("Error stopping stream:", e)
+        print("Stream stopped.")
+
+    def _read_loop(self):
+        n_ch = len(self.names)
+
+        while self.running:
+            try:
+                data, device_backlog, ljm_backlog = self.ljm.eStreamRead(self.handle)
+            except self.ljm.LJMError as e:
+                print("Stream read error:", e)
+                self.running = False
+                for callback in self.on_error:
+                    callback(e)
+                break
+
+            # Interleaved [ch0, ch1, ..., ch0, ch1, ...] -> scans x channels
+            scans = np.asarray(data, dtype=float).reshape(-1, n_ch)
+            skipped = scans == SKIPPED_SAMPLE
+            if skipped.any():
+                self.skipped_scans += int(skipped.any(axis=1).sum())
+                scans[skipped] = np.nan
+
+            n = scans.shape[0]
+            scan_s = (self.scan_count + np.arange(n)) / self.scan_rate
+            times = None
+            if self.start_device_s is not None:
+                times = self.clock.to_host(self.start_device_s + scan_s)
+            if times is None:
+                times = self.start_time + scan_s
+            self.buffer.add_block(times, scans.T)
+
+            self.scan_count += n
+            self.device_backlog = device_backlog
+            self.ljm_backlog = ljm_backlog
+            for callback in self.on_read:
+                callback()
+
+            # Host falling behind the device
+            if ljm_backlog > 10 * self.scans_per_read:
+                print(f"[STREAM] Host backlog {ljm_backlog} scans")
+
+    def latest(self):
+        # Most recent streamed value per channel
+        return self.buffer.latest_values()
+
+    def stats(self):
+        return {
+            "scan_rate": self.scan_rate,
+            "scans": self.scan_count,
+            "device_backlog": self.device_backlog,
+            "ljm_backlog": self.ljm_backlog,
+            "skipped_scans": self.skipped_scans,
+        }
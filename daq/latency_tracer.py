@@ -0,0 +1,96 @@
+import threading
+import time
+from collections import deque
+import numpy as np
+
+# Per-block latency tracing through the pipeline.
+# DAQ_Thread stamps every SampleBlock with monotonic_ns at "read" (newest sample
+# acquired) and "emit" (signal sent). Later stages report when they finished
+# with the block, and the tracer keeps a rolling window of read -> stage
+# latencies for each one. "sample_age" is the oldest sample's own timestamp
+# (block.t[0], host monotonic) -> safety: blocks are assembled for up to
+# DAQ_BLOCK_LATENCY_MS, so that is how stale the data really was when the
+# watchdog made its decision, where read -> safety only covers the hand-off.
+
+STAGES = ("emit", "safety", "render", "logged", "sample_age")
+
+# Log-spaced histogram bins, 0.01 ms .. 10 s
+BIN_EDGES_MS = np.logspace(-2, 4, 61)
+
+
+class RollingLatency:
+    def __init__(self, window):
+        self.values = np.full(window, np.nan) # ms
+        self.count = 0
+
+    def add(self, ms):
+        self.values[self.count % len(self.values)] = ms
+        self.count += 1
+
+    def summary(self):
+        v = self.values[:min(self.count, len(self.values))]
+        if len(v) == 0:
+            return None
+        p50, p90, p99 = np.percentile(v, [50, 90, 99])
+        return {"p50": p50, "p90": p90, "p99": p99, "max": float(v.max()), "n": self.count}
+
+    def histogram(self):
+        v = self.values[:min(self.count, len(self.values))]
+        counts, _ = np.histogram(v, bins=BIN_EDGES_MS)
+        return counts
+
+
+class LatencyTracer:
+    def __init__(self, window=2000):
+        self.stages = {stage: RollingLatency(window) for stage in STAGES}
+        self.lock = threading.Lock()
+
+        # Blocks in the buffer not drawn yet: (buffer count after block, read_ns)
+        self.pending_render = deque(maxlen=1000)
+
+    def record(self, stage, block, stage_ns=None):
+        read_ns = block.stamps.get("read")
+        if read_ns is None:
+            return
+        stage_ns = stage_ns or time.monotonic_ns()
+        with self.lock:
+            self.stages[stage].add((stage_ns - read_ns) / 1e6)
+
+    def record_age(self, block, stage_ns=None):
+        # Oldest sample in the block -> now (or stage_ns)
+        if len(block) == 0:
+            return
+        stage_ns = stage_ns or time.monotonic_ns()
+        with self.lock:
+            self.stages["sample_age"].add((stage_ns / 1e9 - block.t[0]) * 1000)
+
+    def block_buffered(self, block, count):
+        # Block is now in the RingBuffer up to sample `count`
+        read_ns = block.stamps.get("read")
+        if read_ns is not None:
+            self.pending_render.append((count, read_ns))
+
+    def rendered(self, count):
+        # Renderer drew everything up to sample `count`
+        now = time.monotonic_ns()
+        with self.lock:
+            while self.pending_render and self.pending_render[0][0] <= count:
+                _, read_ns = self.pending_render.popleft()
+                self.stages["render"].add((now - read_ns) / 1e6)
+
+    def summary(self):
+        with self.lock:
+            return {stage: hist.summary() for stage, hist in self.stages.items()}
+
+    def histograms(self):
+        with self.lock:
+            return {stage: hist.histogram() for stage, hist in self.stages.items()}
+
+    def summary_text(self):
+        # One line for logs/console
+        parts = []
+        for stage, s in self.summary().items():
+            if s:
+                label = "oldest->safety" if stage == "sample_age" else f"read->{stage}"
+                parts.append(f"{label} p50={s['p50']:.1f}ms p99={s['p99']:.1f}ms")
+        return "LATENCY " + "; ".join(parts)
@@ -0,0 +1,157 @@
+import threading
+import time
+import numpy as np
+import config.system_config as system_config
+from daq.channels import CHANNELS, CHANNEL_INDEX
+from daq.sample_block import SampleBlock
+from daq.stream_buffer import RingBuffer
+
+# Multi-rate acquisition on top of any backend with read_channels(names).
+# Each CHANNEL_GROUPS entry is polled on its own thread at its own rate
+# (absolute monotonic deadlines) into its own RingBuffer. The fastest group,
+# or the T7 stream when it carries that group's channels, sets the timeline.
+# Slower groups are merged onto it by timestamp: with SLOW_FILL = "hold" every
+# row carries the last reading, with "nan" only the first row after a new
+# reading has it and the rest are NaN.
+
+
+class MultiRateDaq:
+    produces_blocks = True
+
+    def __init__(self, daq, groups=None, fill=None, block_size=None, block_latency_ms=None):
+        self.daq = daq
+        self.fill = fill or system_config.SLOW_FILL
+        groups = groups or system_config.CHANNEL_GROUPS
+
+        self.groups = []
+        for name, group in sorted(groups.items(), key=lambda g: -g[1]["rate_hz"]):
+            channels = [ch for ch in group["channels"] if ch in CHANNEL_INDEX]
+            self.groups.append({
+                "name": name,
+                "channels": channels,
+                "rows": [CHANNEL_INDEX[ch] for ch in channels],
+                "rate_hz": group["rate_hz"],
+                "buffer": RingBuffer(channels, max(1000, int(group["rate_hz"] * 10))),
+                "cursor": 0,
+                "hold": np.full(len(channels), np.nan), # Last value merged
+                "reads": 0,
+                "overruns": 0, # Read slots missed because a read ran long
+            })
+
+        self.base = self.groups[0] # Fastest group sets the timeline
+        self.base_source = None
+        self.base_cursor = 0
+
+        rate = self.base["rate_hz"]
+        latency = (block_latency_ms or system_config.DAQ_BLOCK_LATENCY_MS) / 1000
+        self.block_size = block_size or max(1, int(rate * latency))
+        self.block_latency = latency
+
+        self.stop_event = threading.Event()
+        self.threads = [
+            threading.Thread(target=self._poll_loop, args=(group,), daemon=True)
+            for group in self.groups
+        ]
+        for thread in self.threads:
+            thread.start()
+
+    def __getattr__(self, name):
+        # Valves, heartbeats, events etc. go straight to the wrapped backend
+        if name == "daq":
+            raise AttributeError(name)
+        return getattr(self.daq, name)
+
+    def _stream_buffer(self, group):
+        # Group is served by the hardware stream if it's running and carries its channels
+        stream = getattr(self.daq, "stream", None)
+        if group is self.base and stream is not None and stream.running:
+            if any(ch in stream.names for ch in group["channels"]):
+                return stream.buffer
+        return None
+
+    # ---- POLLING THREADS ----
+    def _poll_loop(self, group):
+        period_ns = int(1e9 / group["rate_hz"])
+        next_ns = time.monotonic_ns()
+        channels = group["channels"]
+
+        while not self.stop_event.wait(max(0, next_ns - time.monotonic_ns()) / 1e9):
+            if self._stream_buffer(group) is None:
+                # Backends that know when the device sampled (its own clock) say so
+                if hasattr(self.daq, "read_channels_timed"):
+                    t, values = self.daq.read_channels_timed(channels)
+                else:
+                    t, values = time.monotonic(), self.daq.read_channels(channels)
+                group["buffer"].add(t, [values.get(ch, np.nan) for ch in channels])
+                group["reads"] += 1
+
+            next_ns += period_ns
+            now = time.monotonic_ns()
+            if now > next_ns + period_ns:
+                # Fell more than a slot behind, skip ahead rather than burst
+                group["overruns"] += 1
+                next_ns = now
+
+    # ---- MERGE ----
+    def read_block(self):
+        source = self._stream_buffer(self.base)
+        if source is None:
+            source = self.base["buffer"]
+        if source is not self.base_source:
+            # Stream (re)started or stopped, carry on from its newest sample
+            self.base_source = source
+            self.base_cursor = source.count
+
+        # Wait for a full block or the latency target
+        deadline = time.monotonic() + self.block_latency
+        step = 1 / self.base["rate_hz"]
+        while source.count - self.base_cursor < self.block_size and time.monotonic() < deadline:
+            if self.stop_event.wait(min(step, max(0, deadline - time.monotonic()))):
+                return None
+
+        times, block, self.base_cursor = source.since(self.base_cursor)
+        if len(times) == 0:
+            return None
+
+        data = np.full((len(CHANNELS), len(times)), np.nan)
+        data[[CHANNEL_INDEX[ch] for ch in source.channels if ch in CHANNEL_INDEX]] = \
+            block[[i for i, ch in enumerate(source.channels) if ch in CHANNEL_INDEX]]
+
+        for group in self.groups[1:]:
+            data[group["rows"]] = self._merge(group, times)
+
+        return SampleBlock(np.array(times), data)
+
+    def _merge(self, group, times):
+        t_s, v_s, count = group["buffer"].since(group["cursor"])
+
+        # Only readings up to the end of this block, later ones wait for the next
+        k = int(np.searchsorted(t_s, times[-1], side="right"))
+        group["cursor"] = count - (len(t_s) - k)
+        t_s, v_s = t_s[:k], v_s[:, :k]
+
+        # Newest reading at or before each row, -1 = still the held one
+        idx = np.searchsorted(t_s, times, side="right") - 1
+        values = np.hstack([group["hold"][:, None], v_s])[:, idx + 1]
+
+        if self.fill == "nan":
+            # Only the first row after each new reading
+            fresh = (idx >= 0) & (idx != np.concatenate([[-1], idx[:-1]]))
+            values[:, ~fresh] = np.nan
+
+        if k:
+            group["hold"] = v_s[:, -1].copy()
+        return values
+
+    def stats(self):
+        return {
+            group["name"]: {"rate_hz": group["rate_hz"], "reads": group["reads"], "overruns": group["overruns"]}
+            for group in self.groups
+        }
+
+    def close(self):
+        self.stop_event.set()
+        for thread in self.threads:
+            thread.join()
+        if hasattr(self.daq, "close"):
+            self.daq.close()
@@ -0,0 +1,116 @@
+import numpy as np
+import time
+import config.system_config as system_config
+from daq.channels import CHANNELS, CHANNEL_INDEX
+from daq.sample_block import SampleBlock
+from logging_data.log_reader import LogReader
+
+class ReplayDaq:
+    """Plays a recorded log (.csv or .dlog) back as if it were live hardware."""
+    def __init__(self, path, speed=1.0, block_size=None, block_latency_ms=None, loop=False):
+        # speed: 1.0 = real time, 10.0 = 10x, None/0 = as fast as possible
+        self.path = path
+        self.speed = speed
+        self.loop = loop
+        self.block_size = block_size or system_config.DAQ_BLOCK_SIZE
+        self.block_latency = (block_latency_ms or system_config.DAQ_BLOCK_LATENCY_MS) / 1000
+
+        reader = LogReader(path)
+        log = reader.read()
+        self.events = reader.events # Original operator/safety events, for reference
+
+        # Recorded channels into the live channel order, anything missing -> NaN
+        self.t = log["time_s"]
+        self.data = np.full((len(CHANNELS), len(self.t)), np.nan)
+        for ch in reader.channels:
+            if ch in CHANNEL_INDEX:
+                self.data[CHANNEL_INDEX[ch]] = log[ch]
+
+        self.valves = {v: False for v in system_config.VALVES}
+        self.produces_blocks = True
+        self.pos = 0
+        self.start = None
+        self.finished = len(self.t) == 0
+
+        print(f"Replay loaded: {len(self.t)} samples from {path} @ {speed or 'max'}x")
+
+    def _restart(self):
+        self.pos = 0
+        self.start = time.monotonic()
+
+    def _host_times(self, t):
+        # Recorded times onto the monotonic clock at playback speed, so samples are
+        # stamped when they're played and live GUI events (ABORT, FAULT...) line up.
+        # As fast as possible has no playback clock, the original spacing is kept.
+        if not self.speed:
+            return self.start + (t - self.t[0])
+        return self.start + (t - self.t[0]) / self.speed
+
+    def _due(self):
+        # Index one past the last sample whose playback time has come
+        if not self.speed:
+            return len(self.t)
+        played = (time.monotonic() - self.start) * self.speed
+        return int(np.searchsorted(self.t, self.t[0] + played, side="right"))
+
+    def read_block(self):
+        if self.finished:
+            return None
+        if self.start is None:
+            self._restart()
+
+        # Wait for a full block or the latency target, whichever comes first
+        deadline = time.monotonic() + self.block_latency
+        while self._due() - self.pos < self.block_size and time.monotonic() < deadline:
+            time.sleep(0.001)
+
+        end = min(self._due(), self.pos + self.block_size)
+        if end <= self.pos:
+            return None
+
+        block = SampleBlock(self._host_times(self.t[self.pos:end]), self.data[:, self.pos:end])
+        self.pos = end
+
+        if self.pos >= len(self.t):
+            if self.loop:
+                self._restart()
+            else:
+                self.finished = True
+                print("Replay finished.")
+
+        return block
+
+    def read_analog(self):
+        # One sample at a time (non-block mode), still paced to the recording
+        if self.finished:
+            return {}
+        if self.start is None:
+            self._restart()
+
+        while self.speed and self._due() <= self.pos:
+            time.sleep(0.001)
+
+        values = dict(zip(CHANNELS, self.data[:, self.pos].tolist()))
+        self.pos += 1
+        if self.pos >= len(self.t):
+            if self.loop:
+                self._restart()
+            else:
+                self.finished = True
+                print("Replay finished.")
+        return values
+
+    def read_channels(self, names):
+        data = self.read_analog()
+        return {name: data[name] for name in names if name in data}
+
+    def set_digital(self, name, state: bool):
+        if name in self.valves:
+            self.valves[name] = state
+            print(f"[REPLAY] {name} valve -> {'OPEN' if state else 'CLOSED'}")
+        else:
+            print(f"[REPLAY] Unknown valve: {name}")
+
+    def set_digital_many(self, states):
+        for name, state in states.items():
+            self.set_digital(name, state)
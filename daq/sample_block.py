@@ -0,0 +1,20 @@
+import numpy as np
+from daq.channels import CHANNELS
+
+class SampleBlock:
+    """A block of samples: timestamps plus a channels x samples array in CHANNELS order."""
+    def __init__(self, t, data):
+        self.t = t       # (n,) host monotonic seconds
+        self.data = data # (len(CHANNELS), n)
+        self.raw = None  # Same shape, volts before calibration (None if the backend gives engineering units)
+        self.filtered = None # Same shape, after daq/filters.py (None if no filter bank)
+        self.stamps = {} # Stage -> time.monotonic_ns(), see latency_tracer.py
+
+    def __len__(self):
+        return len(self.t)
+
+    @classmethod
+    def from_dict(cls, t, values: dict):
+        # Single sample from a read_analog() dict, missing channels -> NaN
+        data = np.array([[values.get(ch, np.nan)] for ch in CHANNELS], dtype=float)
+        return cls(np.array([t], dtype=float), data)
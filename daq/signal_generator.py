@@ -0,0 +1,65 @@
+import numpy as np
+from daq.channels import CHANNELS, CHANNEL_INDEX
+
+# Deterministic synthetic signals for load testing without hardware.
+# Whole blocks are generated at once with NumPy: each channel is a base value
+# plus seeded Gaussian noise, with scripted events layered on top. Same seed,
+# profiles and block sizes = same samples, so a scenario can be replayed exactly.
+#
+# Profile per channel:
+#   {"base": 305, "noise": 3, "events": [...]}
+# Events (times in seconds from start):
+#   {"type": "ramp", "start": 10, "end": 12, "delta": 200}   linear change, held after end
+#   {"type": "step", "at": 15, "delta": -100}                 instant change, held
+#   {"type": "spike", "at": 11, "width": 0.02, "height": 50} short pulse
+#   {"type": "noise_burst", "start": 20, "end": 21, "std": 10} extra noise
+#   {"type": "dropout", "start": 30, "end": 30.5}             NaN (lost signal)
+
+EVENT_TYPES = ("ramp", "step", "spike", "noise_burst", "dropout")
+
+
+class SignalGenerator:
+    def __init__(self, rate_hz, profiles, seed=None):
+        self.rate = rate_hz
+        self.rng = np.random.default_rng(seed)
+        self.n = 0 # Samples generated so far
+
+        self.base = np.zeros(len(CHANNELS))
+        self.noise = np.zeros(len(CHANNELS))
+        self.events = [] # (channel index, event dict)
+
+        for ch, profile in profiles.items():
+            if ch not in CHANNEL_INDEX:
+                print(f"[SIM] Unknown channel in profile: {ch}")
+                continue
+            i = CHANNEL_INDEX[ch]
+            self.base[i] = profile.get("base", 0.0)
+            self.noise[i] = profile.get("noise", 0.0)
+            for event in profile.get("events", []):
+                if event["type"] not in EVENT_TYPES:
+                    raise ValueError(f"Unknown sim event type: {event['type']}")
+                self.events.append((i, event))
+
+    def generate(self, n):
+        # Next n samples -> (t from start, channels x n)
+        t = (self.n + np.arange(n)) / self.rate
+        self.n += n
+
+        data = self.base[:, None] + self.noise[:, None] * self.rng.standard_normal((len(CHANNELS), n))
+
+        for i, e in self.events:
+            kind = e["type"]
+            if kind == "ramp":
+                frac = np.clip((t - e["start"]) / (e["end"] - e["start"]), 0.0, 1.0)
+                data[i] += e["delta"] * frac
+            elif kind == "step":
+                data[i] += np.where(t >= e["at"], e["delta"], 0.0)
+            elif kind == "spike":
+                data[i] += np.where(np.abs(t - e["at"]) <= e["width"] / 2, e["height"], 0.0)
+            elif kind == "noise_burst":
+                burst = (t >= e["start"]) & (t < e["end"])
+                data[i, burst] += e["std"] * self.rng.standard_normal(int(burst.sum()))
+            elif kind == "dropout":
+                data[i, (t >= e["start"]) & (t < e["end"])] = np.nan
+
+        return t, data
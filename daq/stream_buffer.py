@@ -1,22 +1,92 @@
 import numpy as np
 import threading
 
-# Circular buffer for high-rate pressure streaming
-# to prevent memory blow-up, gives GUI rolling data
+# Multi-channel ring buffer (channels x samples) for high-rate data
+# to prevent memory blow-up, gives GUI/logger/watchdogs one shared rolling history.
+# Blocks are written with slice assignment, and `count` only ever goes up so
+# readers can keep a cursor and ask for everything written since sample N.
 
-class CircularBuffer:
-    def __init__(self, size):
+class RingBuffer:
+    def __init__(self, channels, size):
+        self.channels = list(channels)
+        self.channel_index = {name: i for i, name in enumerate(self.channels)}
         self.size = size
-        self.data = np.zeros(size)
-        self.index = 0
-        self.lock = threading.lock()
-    
-    def add(self, new_data):
+
+        self.times = np.full(size, np.nan)
+        self.data = np.full((len(self.channels), size), np.nan)
+        self.count = 0 # Total samples ever written
+        self.lock = threading.Lock()
+
+    def add(self, t, values):
+        # Single sample, values in channel order
+        self.add_block([t], np.asarray(values, dtype=float).reshape(-1, 1))
+
+    def add_block(self, times, block):
+        times = np.asarray(times, dtype=float)
+        block = np.asarray(block, dtype=float)
+        n = len(times)
+        if n == 0:
+            return
+
+        with self.lock:
+            total = self.count + n
+
+            # Only the newest `size` samples can survive the write
+            if n > self.size:
+                times = times[-self.size:]
+                block = block[:, -self.size:]
+                n = self.size
+
+            pos = (total - n) % self.size
+            first = min(n, self.size - pos)
+            self.times[pos:pos + first] = times[:first]
+            self.data[:, pos:pos + first] = block[:, :first]
+
+            # Wrap around to the start
+            rest = n - first
+            if rest:
+                self.times[:rest] = times[first:]
+                self.data[:, :rest] = block[:, first:]
+
+            self.count = total
+
+    def latest(self, n=None):
+        # Newest n samples, oldest first -> (times, channels x n).
+        # A view into the buffer when the span doesn't wrap, otherwise a copy,
+        # so treat it as read-only and don't hold onto it across writes.
         with self.lock:
-            for value in new_data:
-                self.data[self.index] = value
-                self.index = (self.index + 1) % self.size
+            available = min(self.count, self.size)
+            n = available if n is None else min(n, available)
+            return self._span(n)
 
-    def get_data(self):
+    def since(self, cursor):
+        # Everything written after sample `cursor` -> (times, block, new_cursor).
+        # Samples that were already overwritten are skipped.
         with self.lock:
-            return np.copy(self.data)
\ No newline at end of file
+            n = min(self.count - cursor, self.size)
+            if n <= 0:
+                return np.empty(0), np.empty((len(self.channels), 0)), self.count
+            times, block = self._span(n)
+            return times, block, self.count
+
+    def _span(self, n):
+        # Newest n samples (lock held by caller)
+        end = self.count % self.size
+        if end == 0 and self.count:
+            end = self.size
+        start = end - n
+
+        if start >= 0:
+            return self.times[start:end], self.data[:, start:end]
+
+        return (
+            np.concatenate((self.times[start:], self.times[:end])),
+            np.concatenate((self.data[:, start:], self.data[:, :end]), axis=1),
+        )
+
+    def latest_values(self):
+        # Most recent sample as {channel: value}
+        times, block = self.latest(1)
+        if len(times) == 0:
+            return {name: float("nan") for name in self.channels}
+        return dict(zip(self.channels, block[:, -1].tolist()))
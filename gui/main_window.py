@@ -6,20 +6,32 @@ from PyQt6.QtWidgets import (
 ) 
 
 import pyqtgraph as pg 
+import numpy as np
 import time 
 import sys 
 import os 
-from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal
 from PyQt6.QtGui import QPixmap 
 
 from daq.dummy_daq import DummyDaq 
 # from daq.labjack_daq import LabJackDaq
 from daq.daq_manager import DAQManager
+# from daq.replay_daq import ReplayDaq
+from daq.multi_rate import MultiRateDaq
 
 from daq.daq_thread import DAQ_Thread 
+from daq.stream_buffer import RingBuffer
+from daq.calibration import Calibration
+from daq.filters import FilterBank, Decimator
+from daq.sample_block import SampleBlock
+from daq.channels import CHANNELS, CHANNEL_INDEX, THRUST_IDX
+from gui.plot_renderer import PlotRenderer
+from daq.latency_tracer import LatencyTracer, BIN_EDGES_MS
 from logging_data.csv_logger import CSVLogger 
+from logging_data.binary_logger import BinaryLogger
 import config.system_config as system_config
 from daq.ignition_sequence import IgnitionSequence
+from safety.safety_thread import safe_valve_states
 from safety.safety_manager import SafetyManager
 
 # Plots Background colour 
@@ -27,22 +39,15 @@ pg.setConfigOption("background", "#434343")
 pg.setConfigOption("foreground", "#DBDBDB") 
 
 class MainWindow(QMainWindow): 
-    def __init__(self): 
+    daq_event = pyqtSignal(str, float) # (event name, monotonic time)
+
+    def __init__(self, daq=None): 
         super().__init__() 
         self.setWindowTitle("DAQ GUI") 
         self.resize(900,600) 
 
         self.system_armed = False # Initially dis-armed 
 
-        # Integrate SAFETY MANAGER
-        self.safety_manager = SafetyManager()
-        self.safety_manager.abort_signal.connect(self.handle_watchdog_abort)
-
-        # Heartbeat timer
-        self.heartbeat_timer = QTimer()
-        self.heartbeat_timer.timeout.connect(self.safety_manager.check_heartbeat)
-        self.heartbeat_timer.start(200) # Check 5x per second (200ms)
-
         # For dark mode 
         self.setStyleSheet(""" 
             QWidget { 
@@ -88,24 +93,69 @@ class MainWindow(QMainWindow):
         central.setLayout(main_layout) 
 
         # =================== DAQ ========================================= 
-        self.daq = DummyDaq() 
+        self.daq = daq or DummyDaq() # Pass a backend in to override (benchmarks, replay)
         # self.daq = LabJackDaq(ip="192.168.1.207") <----- CHANGE IP or change to serial number etc
         # self.daq = DAQManager()
+        # self.daq = DummyDaq(rate_hz=system_config.SIM_RATE_HZ, seed=system_config.SIM_SEED, profiles=system_config.SIM_PROFILES)
+        # self.daq = ReplayDaq("logs_NEW/daq_log_XXXXXXXX_XXXXXX.csv", speed=10.0) # Re-run a recorded test
 
-        self.daq_thread = DAQ_Thread(self.daq, system_config.DAQ_INTERVAL_MS) 
-        self.daq_thread.data_ready.connect(self.handle_new_data) 
-        self.daq_thread.start() 
+        # Polled backends: each CHANNEL_GROUPS group at its own rate instead of everything at DAQ_INTERVAL_MS
+        if system_config.MULTI_RATE_ENABLED and not getattr(self.daq, "produces_blocks", False):
+            self.daq = MultiRateDaq(self.daq)
+
+        self.start_time = time.monotonic() # Same clock as the DAQ thread's sample times
+
+        # Read -> emit/safety/render/logged latency per block
+        self.tracer = LatencyTracer()
+        self.last_latency_log = time.monotonic()
+
+        # Hardware backends give volts, converted on the DAQ thread before safety/plots/logging
+        self.calibration = Calibration() if getattr(self.daq, "returns_raw", False) else None
+
+        # Volts of every calibrated channel go alongside into the buffer/log as <channel>_raw
+        self.raw_rows = self.calibration.rows if self.calibration and system_config.LOG_RAW else []
+        self.log_channels = CHANNELS + [f"{CHANNELS[i]}_raw" for i in self.raw_rows]
+
+        # Filtered copy of each block for the plots (and the watchdogs if SAFETY_USE_FILTERED)
+        self.filters = FilterBank() if system_config.FILTERS else None
+
+        self.daq_thread = DAQ_Thread(
+            self.daq, system_config.DAQ_INTERVAL_MS,
+            block_size=system_config.DAQ_BLOCK_SIZE,
+            block_latency_ms=system_config.DAQ_BLOCK_LATENCY_MS,
+            calibration=self.calibration,
+            filters=self.filters,
+        ) 
+        self.daq_thread.block_ready.connect(self.handle_new_block) 
+        self.daq_thread.data_ready.connect(self.handle_new_data) # Non-block mode
+
+        # Integrate SAFETY MANAGER
+        # Watchdogs run on their own real-time thread fed straight from the DAQ thread,
+        # it commands the safe state itself and the GUI is told afterwards
+        self.safety_manager = SafetyManager(self.daq)
+        self.safety_manager.abort_signal.connect(self.handle_watchdog_abort)
+        self.safety_manager.thread.on_trip.append(self.abort_ignition)
+        self.safety_manager.start(self.daq_thread, self.tracer)
 
-        self.start_time = time.time() 
-        self.time_data = [] 
-        self.pressure_data = {ch: [] for ch in system_config.PRESSURE_CHANNELS} 
-        self.temp_data = {ch: [] for ch in system_config.TEMP_CHANNELS} 
+        # Latched SAFE/ARMED/FIRING/ABORTED, shared with the safety thread
+        self.state = self.safety_manager.state
+        self.state.state_changed.connect(self.set_system_state)
 
-        # Thrust data (load cell data) 
-        self.thrust_data = [] 
+        # Backend events (e.g. LabJack disconnect/reconnect) from its own threads, into the log
+        if hasattr(self.daq, "on_event"):
+            self.daq_event.connect(self.handle_daq_event)
+            self.daq.on_event.append(self.daq_event.emit)
+
+        self.daq_thread.start() 
+
+        # Plots draw from a filtered, decimated rolling copy, the logger gets every
+        # full-rate block straight from handle_new_block
+        self.display_buffer = RingBuffer(CHANNELS, system_config.MAX_DATA_POINTS)
+        self.decimator = Decimator(system_config.DISPLAY_DECIMATION)
 
         self.ignition_thread = None 
         self.ignition_running = False 
+        self.ignition_timings = [] # Step timing from the last run
 
         # Define/Create status labels first BEFORE building status box 
         self.time_label = QLabel("Time: 0.0 s") 
@@ -117,12 +167,14 @@ class MainWindow(QMainWindow):
         self.stop_log_button = QPushButton("Stop Data Logging") 
         self.arm_button = QPushButton("ARM") 
         self.abort_button = QPushButton("ABORT") 
+        self.reset_button = QPushButton("RESET") # Clears a latched abort
 
         # Connect the buttons and initialise appropriate response 
         self.start_log_button.clicked.connect(self.start_logging) 
         self.stop_log_button.clicked.connect(self.stop_logging) 
         self.arm_button.clicked.connect(self.arm_system) 
         self.abort_button.clicked.connect(self.abort_system) 
+        self.reset_button.clicked.connect(self.reset_system)
 
         self.stop_log_button.setEnabled(False) # Log button originally OFF 
 
@@ -151,10 +203,12 @@ class MainWindow(QMainWindow):
         self.data_btn = QPushButton("Data Display") 
         self.config_btn = QPushButton("System Config") 
         self.pid_btn = QPushButton("PID") 
+        self.diag_btn = QPushButton("Diagnostics") 
 
         sidebar.addWidget(self.data_btn) 
         sidebar.addWidget(self.config_btn) 
         sidebar.addWidget(self.pid_btn) 
+        sidebar.addWidget(self.diag_btn) 
 
         sidebar.addSpacing(20) 
 
@@ -173,6 +227,12 @@ class MainWindow(QMainWindow):
         """) 
 
         sidebar.addWidget(self.state_label) 
+
+        # First fault since the last reset
+        self.fault_label = QLabel("")
+        self.fault_label.setWordWrap(True)
+        self.fault_label.setStyleSheet("color: #C62828; font-weight: bold")
+        sidebar.addWidget(self.fault_label)
         sidebar.addSpacing(15) 
 
         self.set_system_state("SAFE") # Initially safe state 
@@ -187,6 +247,7 @@ class MainWindow(QMainWindow):
         control_layout.addSpacing(10) 
         control_layout.addWidget(self.arm_button) 
         control_layout.addWidget(self.abort_button) 
+        control_layout.addWidget(self.reset_button)
         control_layout.addSpacing(10) 
 
         # E-STOP styling for abort button 
@@ -279,6 +340,15 @@ class MainWindow(QMainWindow):
             pen=pg.mkPen("c",width=2) 
         ) 
 
+        # Plots redraw on their own timer, independent of the sample rate
+        self.renderer = PlotRenderer(self.display_buffer, self.data_page, system_config.PLOT_FPS)
+        for ch, curve in self.pressure_curves.items():
+            self.renderer.add_curve(curve, CHANNEL_INDEX[ch], self.pressure_plot)
+        for ch, curve in self.temp_curves.items():
+            self.renderer.add_curve(curve, CHANNEL_INDEX[ch], self.temp_plot)
+        self.renderer.add_curve(self.thrust_curve, THRUST_IDX, self.thrust_plot)
+        self.renderer.rendered.connect(self.tracer.rendered)
+
         plot_layout = QVBoxLayout() 
         data_layout.addLayout(plot_layout,3) # 3 = width ratio for plots 
 
@@ -456,47 +526,112 @@ class MainWindow(QMainWindow):
         self.pid_page.setLayout(pid_layout) 
         pid_layout.addWidget(QLabel("PID Controller settings")) 
 
+        # 4. Diagnostics (pipeline latency) --------------------------------------
+        self.diag_page = QWidget()
+        diag_layout = QVBoxLayout()
+        self.diag_page.setLayout(diag_layout)
+
+        self.latency_label = QLabel("Latency: --")
+        self.latency_label.setStyleSheet("font-family: monospace;")
+        diag_layout.addWidget(self.latency_label)
+
+        self.latency_plot = pg.PlotWidget(title="Latency histogram (read -> stage)")
+        self.latency_plot.setLogMode(x=True, y=False)
+        self.latency_plot.setLabel("bottom", "Latency", units="ms")
+        self.latency_plot.addLegend()
+        self.latency_curves = {}
+        for i, stage in enumerate(self.tracer.stages):
+            self.latency_curves[stage] = self.latency_plot.plot(
+                stepMode="center", pen=pg.mkPen(colours[i % len(colours)], width=2), name=stage
+            )
+        diag_layout.addWidget(self.latency_plot)
+
+        self.diag_timer = QTimer()
+        self.diag_timer.timeout.connect(self.update_diagnostics)
+        self.diag_timer.start(500)
+
         # Stack usability ------------------------------------------------------- 
         # Add pages to stack 
         self.stack.addWidget(self.data_page)    # index 0 
         self.stack.addWidget(self.config_page)  # index 1 
         self.stack.addWidget(self.pid_page)     # index 2 
+        self.stack.addWidget(self.diag_page)    # index 3 
  
         # Connect sidebar buttons to switch pages 
         self.data_btn.clicked.connect(lambda: self.stack.setCurrentIndex(0)) 
         self.config_btn.clicked.connect(lambda: self.stack.setCurrentIndex(1)) 
-        self.pid_btn.clicked.connect(lambda: self.stack.setCurrentIndex(2)) 
+        self.pid_btn.clicked.connect(lambda: self.stack.setCurrentIndex(2))
+        self.diag_btn.clicked.connect(lambda: self.stack.setCurrentIndex(3)) 
 
         # LOGGING -------------------------------------------------------------- 
-        headers = ["time_s"] + system_config.PRESSURE_CHANNELS + system_config.TEMP_CHANNELS + ["thrust", "event"] 
-        self.logger = CSVLogger(headers) 
+        if system_config.LOG_FORMAT == "binary":
+            self.logger = BinaryLogger(
+                self.log_channels,
+                units={**system_config.CHANNEL_UNITS, **{ch: "V" for ch in self.log_channels[len(CHANNELS):]}},
+                chunk_rows=system_config.LOG_CHUNK_ROWS,
+                compression=system_config.LOG_COMPRESSION,
+            )
+        else:
+            headers = ["time_s"] + self.log_channels + ["event"] 
+            self.logger = CSVLogger(
+                headers,
+                threaded=system_config.LOG_THREADED,
+                max_queued_rows=system_config.LOG_MAX_QUEUED_ROWS,
+                flush_interval_s=system_config.LOG_FLUSH_INTERVAL_S,
+                fsync=system_config.LOG_FSYNC,
+            ) 
         self.logging_enabled = False # No data logging initially 
 
     # ================== LOGIC/HELPER FUNCTIONS ====================================== 
     # ARM/ABORT logic 
     def arm_system(self): 
+        if not self.state.arm():
+            if self.state.state == "ABORTED":
+                print("Cannot arm — RESET the abort first")
+            return
+
         self.system_armed = True 
         self.update_valve_buttons() 
-        self.set_system_state("ARMED") 
         self.log_event("ARM") 
         print("SYSTEM ARMED") 
 
     def abort_system(self): 
+        # Operator abort, always re-commands the safe state
+        new = self.state.abort("OPERATOR ABORT")
+
         if self.ignition_thread and self.ignition_running: 
             self.ignition_thread.abort() 
 
-        self.system_armed = False 
+        # All valves to their safe states in one write
+        self.daq.set_digital_many(safe_valve_states())
 
-        # Close all valves 
-        for valve in system_config.VALVES: 
-            self.daq.set_digital(valve, False) 
+        if new:
+            self.enter_aborted("OPERATOR ABORT")
 
+    def enter_aborted(self, reason):
+        # GUI side of an abort, once per new cause (valves already commanded)
+        self.system_armed = False 
         self.update_valve_buttons() 
-        self.log_event("ABORT") 
-        self.set_system_state("ABORTED") 
+
+        first = self.state.first_fault
+        if first and first["reason"] == reason:
+            self.log_event("ABORT", t=first["t"] - self.start_time)
+            self.fault_label.setText(f"First fault: {reason} @ {first['t'] - self.start_time:.2f}s")
+        self.log_event(f"FAULT {reason}")
 
         print("ABORT triggered. All valves returned to nominal states") 
 
+    def reset_system(self):
+        if self.ignition_running:
+            print("Cannot reset while the ignition sequence is running")
+            return
+        if not self.state.reset():
+            return
+
+        self.fault_label.setText("")
+        self.log_event("RESET")
+        print("Abort reset. System SAFE, ARM again to continue")
+
     def update_valve_buttons(self): 
         for valve, btn in self.valve_buttons.items(): 
             btn.setEnabled(self.system_armed) 
@@ -520,6 +655,8 @@ class MainWindow(QMainWindow):
         } 
 
         self.state_label.setText(state) 
+        self.arm_button.setEnabled(state == "SAFE")
+        self.reset_button.setEnabled(state == "ABORTED")
         self.state_label.setStyleSheet(f""" 
             QLabel {{ 
                 background-color: {colors[state]}; 
@@ -592,10 +729,15 @@ class MainWindow(QMainWindow):
             print("Ignition already running") 
             return 
 
+        if not self.state.fire():
+            print(f"Cannot ignite from {self.state.state}")
+            return
+
         self.ignition_thread = IgnitionSequence(self.daq) 
         self.ignition_thread.step_signal.connect(self.handle_ignition_step) 
         self.ignition_thread.finished_signal.connect(self.ignition_complete) 
         self.ignition_thread.aborted_signal.connect(self.ignition_aborted) 
+        self.ignition_thread.timing_signal.connect(self.handle_ignition_timing)
  
         self.ignition_running = True 
         for btn in self.valve_buttons.values():
@@ -603,7 +745,6 @@ class MainWindow(QMainWindow):
         self.ignition_thread.start() 
  
         self.log_event("IGNITION_START") 
-        self.set_system_state("FIRING") 
 
     def handle_ignition_step(self, valve_name, state):
         # Ignore non-valve signals
@@ -618,7 +759,7 @@ class MainWindow(QMainWindow):
     def ignition_complete(self): 
         self.ignition_running = False 
         self.log_event("IGNITION_DONE") 
-        self.set_system_state("ARMED") 
+        self.state.fire_complete() # No-op if it was aborted
         for btn in self.valve_buttons.values():
             btn.setEnabled(self.system_armed)
         print("Ignition sequence complete") 
@@ -630,6 +771,36 @@ class MainWindow(QMainWindow):
             btn.setEnabled(self.system_armed)
         print("Ignition sequence aborted") 
 
+    def handle_ignition_timing(self, timings):
+        # Scheduled vs actual for each step, logged at the time the command was sent
+        self.ignition_timings = timings
+        for step in timings:
+            self.log_event(
+                f"STEP {step['valve']}={step['state']} sched {step['scheduled_s']:.3f}s "
+                f"actual {step['actual_s']:.6f}s late {step['late_ms']:.3f}ms cmd {step['command_ms']:.3f}ms",
+                t=step["sent_ns"] / 1e9 - self.start_time,
+            )
+        for line in self.ignition_timing_lines():
+            print(line)
+        self.update_diagnostics()
+
+    def ignition_timing_lines(self):
+        lines = [f"{'step':<18}{'sched s':>9}{'actual s':>12}{'late ms':>9}{'cmd ms':>8}"]
+        for step in self.ignition_timings:
+            lines.append(
+                f"{step['valve'] + '=' + str(step['state']):<18}{step['scheduled_s']:9.3f}"
+                f"{step['actual_s']:12.6f}{step['late_ms']:9.3f}{step['command_ms']:8.3f}"
+            )
+        # Gaps between steps, e.g. the igniter -> MOV offset
+        for prev, step in zip(self.ignition_timings, self.ignition_timings[1:]):
+            scheduled = step["scheduled_s"] - prev["scheduled_s"]
+            actual = step["actual_s"] - prev["actual_s"]
+            lines.append(
+                f"{prev['valve']} -> {step['valve']}: {actual:.6f}s "
+                f"(scheduled {scheduled:.3f}s, error {(actual - scheduled) * 1e3:+.3f}ms)"
+            )
+        return lines
+
     # Logging start/stop 
     def start_logging(self): 
         self.logging_enabled = True 
@@ -645,16 +816,13 @@ class MainWindow(QMainWindow):
         print("Logging stopped") 
 
     # Log events 
-    def log_event(self, event_name: str): 
+    def log_event(self, event_name: str, t=None): 
         if not self.logging_enabled: 
             return 
          
-        t = time.time() - self.start_time 
-
-        # Fill data columns with blanks so structure stays consistent 
-        empty_data = [""]*(len(system_config.PRESSURE_CHANNELS) + len(system_config.TEMP_CHANNELS)) 
-        row = [t] + empty_data + [event_name] 
-        self.logger.write_row(row) 
+        if t is None:
+            t = time.monotonic() - self.start_time 
+        self.logger.log_event(t, event_name) 
 
         print(f"[EVENT] {event_name} @ {t:.2f}s") 
 
@@ -691,6 +859,11 @@ class MainWindow(QMainWindow):
 T7_IP = "{system_config.T7_IP}"
 T7_PRO_IP = "{system_config.T7_PRO_IP}"
 
+RECONNECT_BACKOFF_S = {system_config.RECONNECT_BACKOFF_S}
+RECONNECT_BACKOFF_MAX_S = {system_config.RECONNECT_BACKOFF_MAX_S}
+CLOCK_SYNC_INTERVAL_S = {system_config.CLOCK_SYNC_INTERVAL_S}
+CLOCK_SYNC_WINDOW = {system_config.CLOCK_SYNC_WINDOW}
+
 # Valves
 VALVES = {valves}
 VALVE_DIO_MAP = {valve_dio_map}
@@ -707,14 +880,55 @@ THRUST_MAP = {thrust_map}
 # DAQ settings
 DAQ_INTERVAL_MS = {daq_interval}
 MAX_DATA_POINTS = {max_data_points}
+DAQ_BLOCK_SIZE = {system_config.DAQ_BLOCK_SIZE}
+DAQ_BLOCK_LATENCY_MS = {system_config.DAQ_BLOCK_LATENCY_MS}
+MULTI_RATE_ENABLED = {system_config.MULTI_RATE_ENABLED}
+CHANNEL_GROUPS = {system_config.CHANNEL_GROUPS}
+SLOW_FILL = {system_config.SLOW_FILL!r}
+PLOT_FPS = {system_config.PLOT_FPS}
+FILTERS = {system_config.FILTERS}
+DISPLAY_DECIMATION = {system_config.DISPLAY_DECIMATION}
+SAFETY_USE_FILTERED = {system_config.SAFETY_USE_FILTERED}
+
+# Simulator
+SIM_RATE_HZ = {system_config.SIM_RATE_HZ}
+SIM_SEED = {system_config.SIM_SEED}
+SIM_PROFILES = {system_config.SIM_PROFILES}
+
+# Logging
+LOG_THREADED = {system_config.LOG_THREADED}
+LOG_MAX_QUEUED_ROWS = {system_config.LOG_MAX_QUEUED_ROWS}
+LOG_FLUSH_INTERVAL_S = {system_config.LOG_FLUSH_INTERVAL_S}
+LOG_FSYNC = {system_config.LOG_FSYNC}
+LOG_FORMAT = "{system_config.LOG_FORMAT}"
+LOG_CHUNK_ROWS = {system_config.LOG_CHUNK_ROWS}
+LOG_COMPRESSION = {system_config.LOG_COMPRESSION!r}
+CHANNEL_UNITS = {system_config.CHANNEL_UNITS}
+LOG_LATENCY_INTERVAL_S = {system_config.LOG_LATENCY_INTERVAL_S}
+CALIBRATION = {system_config.CALIBRATION}
+LOG_RAW = {system_config.LOG_RAW}
+THERMOCOUPLE_EF = {system_config.THERMOCOUPLE_EF}
+THERMOCOUPLE_UNITS = "{system_config.THERMOCOUPLE_UNITS}"
+THERMOCOUPLE_CJC = {system_config.THERMOCOUPLE_CJC}
+
+# Stream mode
+STREAM_ENABLED = {system_config.STREAM_ENABLED}
+STREAM_SCAN_RATE_HZ = {system_config.STREAM_SCAN_RATE_HZ}
+STREAM_SCANS_PER_READ = {system_config.STREAM_SCANS_PER_READ}
+STREAM_BUFFER_SIZE = {system_config.STREAM_BUFFER_SIZE}
 
 # Safety limits
 PRESSURE_LIMITS = {pressure_limits}
 TEMP_LIMITS = {temp_limits}
+SAFETY_RULES = {system_config.SAFETY_RULES}
 HEARTBEAT_TIMEOUT_S = {heartbeat_timeout}
 
 # Safe valve states
 DIO_SAFE_STATES = {safe_states}
+
+# Hot fire sequence
+IGNITION_SEQUENCE = {system_config.IGNITION_SEQUENCE}
+IGNITION_SPIN_S = {system_config.IGNITION_SPIN_S}
 """
 
             current_dir = os.path.dirname(os.path.abspath(__file__)) # Path to THIS file (main.window.py) 
@@ -748,67 +962,111 @@ DIO_SAFE_STATES = {safe_states}
 
     # Handle incoming data 
     def handle_new_data(self, data): 
-        t = time.time() - self.start_time 
-
-        # SAFEY EVALUATION FIRST
-        self.safety_manager.evaluate_sensors(data)
-        self.safety_manager.heartbeat()
+        # Single dict sample (DAQ_Thread not in block mode)
+        self.handle_new_block(SampleBlock.from_dict(time.monotonic(), data))
 
-        # Append all data 
-        self.time_data.append(t) 
-        for key in system_config.PRESSURE_CHANNELS: 
-            self.pressure_data[key].append(data[key]) 
+    def handle_new_block(self, block): 
+        shown = block.filtered if block.filtered is not None else block.data
+        self.display_buffer.add_block(*self.decimator.process(block.t - self.start_time, shown))
+        self.tracer.record("emit", block, block.stamps.get("emit"))
+        self.tracer.block_buffered(block, self.display_buffer.count)
 
-        for key in system_config.TEMP_CHANNELS: 
-            self.temp_data[key].append(data[key]) 
+        # Safety evaluation already happened on the safety thread
 
-        thrust = data.get("thrust", None) 
-        if thrust is not None: 
-            self.thrust_data.append(thrust) 
-      
-        # Trim all data together 
-        if len(self.time_data) > system_config.MAX_DATA_POINTS: 
-            self.time_data = self.time_data[-system_config.MAX_DATA_POINTS:] 
-            for key in system_config.PRESSURE_CHANNELS: 
-                self.pressure_data[key] = self.pressure_data[key][-system_config.MAX_DATA_POINTS:] 
-            for key in system_config.TEMP_CHANNELS: 
-                self.temp_data[key] = self.temp_data[key][-system_config.MAX_DATA_POINTS:] 
-            self.thrust_data = self.thrust_data[-system_config.MAX_DATA_POINTS:] 
-
-        # Update plots 
-        for ch, curve in self.pressure_curves.items(): 
-            curve.setData(self.time_data, self.pressure_data[ch]) 
-        for ch, curve in self.temp_curves.items(): 
-            curve.setData(self.time_data, self.temp_data[ch]) 
-        if thrust is not None: 
-            self.thrust_curve.setData(self.time_data, self.thrust_data) 
+        # Plots are redrawn by self.renderer, just the status labels here
+        thrust = shown[THRUST_IDX, -1]
+        if not np.isnan(thrust): 
             self.thrust_label.setText(f"Thrust: {thrust:.1f} N") 
 
-        self.time_label.setText(f"Time: {t:.1f} s") 
+        self.time_label.setText(f"Time: {block.t[-1] - self.start_time:.1f} s") 
 
-        # CSV logging 
+        # CSV logging, the whole block at full rate (plus the volts of calibrated channels)
         if self.logging_enabled: 
-            row = ([t]  
-            + [data[ch] for ch in system_config.PRESSURE_CHANNELS + system_config.TEMP_CHANNELS] 
-            + [data.get("thrust", "")] 
-            + [""]) 
-            self.logger.write_row(row) 
+            data = block.data
+            if self.raw_rows:
+                raw = block.raw[self.raw_rows] if block.raw is not None else np.full((len(self.raw_rows), len(block)), np.nan)
+                data = np.vstack((data, raw))
+            self.logger.write_block(block.t - self.start_time, data) 
+            self.tracer.record("logged", block)
+
+    # Diagnostics page + optional latency summary into the log
+    def update_diagnostics(self):
+        interval = system_config.LOG_LATENCY_INTERVAL_S
+        if interval and self.logging_enabled and time.monotonic() - self.last_latency_log >= interval:
+            self.last_latency_log = time.monotonic()
+            self.log_event(self.tracer.summary_text())
+
+        if not self.diag_page.isVisible():
+            return
+
+        lines = [f"{'read ->':<10}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}   (ms)"]
+        for stage, s in self.tracer.summary().items():
+            if s:
+                lines.append(f"{stage:<10}{s['p50']:9.2f}{s['p90']:9.2f}{s['p99']:9.2f}{s['max']:9.2f}")
+            else:
+                lines.append(f"{stage:<10}{'--':>9}")
+        safety = self.safety_manager.stats()
+        for key in ("detect_to_actuate", "read_to_actuate"):
+            if key in safety:
+                lines.append(f"safety {key}: max {safety[key]['max_ms']:.2f} ms, p99 {safety[key]['p99_ms']:.2f} ms")
+        for source, hb in safety.get("heartbeat", {}).items():
+            line = f"heartbeat {source}: age {hb['age_ms']:.1f} ms"
+            if hb["mean_interval_ms"] is not None:
+                line += f", interval {hb['mean_interval_ms']:.1f} ms (max {hb['max_interval_ms']:.1f})"
+            if hb["jitter_ms"] is not None:
+                line += f", jitter {hb['jitter_ms']:.2f} ms"
+            if hb["timed_out"]:
+                line += "  TIMED OUT"
+            lines.append(line)
+        if hasattr(self.daq, "clock_stats"):
+            for dev, clock in self.daq.clock_stats().items():
+                if clock:
+                    lines.append(
+                        f"clock {dev}: drift {clock['drift_ppm']:+.1f} ppm, rtt min {clock['rtt_min_ms']:.2f} ms, "
+                        f"fit residual {clock['residual_ms']:.3f} ms ({clock['points']} pts)"
+                    )
+        if safety.get("suppressed"):
+            lines.append(f"safety repeat trips suppressed: {safety['suppressed']}")
+        if safety.get("failed_actuations"):
+            lines.append(f"safety trips NOT fully actuated (device down): {safety['failed_actuations']}")
+        if self.ignition_timings:
+            lines += ["", "Last ignition sequence:"] + self.ignition_timing_lines()
+        self.latency_label.setText("\n".join(lines))
+
+        for stage, counts in self.tracer.histograms().items():
+            self.latency_curves[stage].setData(BIN_EDGES_MS, counts)
+
+    # Called on the safety thread when it trips, before valves are actuated
+    def abort_ignition(self):
+        if self.ignition_thread and self.ignition_running:
+            self.ignition_thread.abort()
+
+    # Backend connection events, into the log
+    def handle_daq_event(self, name, t):
+        print(f"[DAQ] {name}")
+        self.log_event(name, t=t - self.start_time)
 
     # Abort handler for watchdog
+    # Safety thread has already latched the abort and commanded the safe state
     def handle_watchdog_abort(self, reason="UNKNOWN"):
         print(f"[SAFETY ABORT] {reason}")
 
         if self.ignition_running and self.ignition_thread:
             self.ignition_thread.abort()
 
-        self.abort_system()
+        self.enter_aborted(reason)
 
     def closeEvent(self, event): 
         print("Shutting down DAQ...") 
  
         try: 
             # Stop DAQ cleanly 
+            self.safety_manager.stop() # No data is coming any more, don't trip on it
+            self.diag_timer.stop()
             self.daq_thread.stop() 
+            if hasattr(self.daq, "close"):
+                self.daq.close()
+            self.renderer.stop()
             if self.logger: 
                 self.logger.close() 
       
@@ -0,0 +1,75 @@
+import numpy as np
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+# Plot rendering decoupled from acquisition.
+# Runs on its own timer at a fixed FPS, pulls the newest data from the shared
+# RingBuffer and only redraws curves that are actually on screen. Each curve
+# is cut down to one min/max pair per horizontal pixel, so drawing cost stays
+# fixed no matter how fast samples come in.
+
+
+def decimate_minmax(t, y, n_bins):
+    # Keep the min and max of each bin (in time order) so spikes survive
+    n = len(y)
+    if n_bins <= 0 or n <= 2 * n_bins:
+        return t, y
+
+    per_bin = n // n_bins
+    start = n - per_bin * n_bins # Drop the oldest remainder, keep the newest data
+    yb = y[start:].reshape(n_bins, per_bin)
+
+    # NaN (dropouts, SLOW_FILL="nan" rows) never wins, all-NaN bins stay NaN
+    nan = np.isnan(yb)
+    offsets = start + np.arange(n_bins) * per_bin
+    i_min = offsets + np.argmin(np.where(nan, np.inf, yb), axis=1)
+    i_max = offsets + np.argmax(np.where(nan, -np.inf, yb), axis=1)
+
+    idx = np.empty(2 * n_bins, dtype=np.intp)
+    idx[0::2] = np.minimum(i_min, i_max)
+    idx[1::2] = np.maximum(i_min, i_max)
+    return t[idx], y[idx]
+
+
+class PlotRenderer(QObject):
+    rendered = pyqtSignal(int) # Buffer count that is now on screen
+
+    def __init__(self, buffer, page, fps=30):
+        super().__init__()
+        self.buffer = buffer
+        self.page = page # Only draw while this page is showing
+        self.curves = [] # [curve, channel index, plot widget, last count drawn]
+
+        self.timer = QTimer()
+        self.timer.timeout.connect(self.render)
+        self.timer.start(int(1000 / fps))
+
+    def add_curve(self, curve, channel_index, plot):
+        self.curves.append([curve, channel_index, plot, -1])
+
+    def render(self):
+        # Skip when the data page isn't the visible stack page or window is minimised
+        if not self.page.isVisible() or self.page.window().isMinimized():
+            return
+
+        count = self.buffer.count
+        times = data = None
+        drawn = False
+
+        for entry in self.curves:
+            curve, idx, plot, last = entry
+            if last == count or not curve.isVisible():
+                continue
+
+            if times is None:
+                times, data = self.buffer.latest()
+
+            t, y = decimate_minmax(times, data[idx], plot.width())
+            curve.setData(t, y)
+            entry[3] = count
+            drawn = True
+
+        if drawn:
+            self.rendered.emit(count)
+
+    def stop(self):
+        self.timer.stop()
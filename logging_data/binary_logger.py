@@ -0,0 +1,211 @@
+import csv
+import json
+import lzma
+import os
+import queue
+import struct
+import threading
+import zlib
+from datetime import datetime
+import numpy as np
+
+# Chunked columnar binary log.
+# <name>.dlog holds fixed-size chunks of raw float64 columns (time first, then
+# one column per channel, each column contiguous). <name>.dlog.json is a small
+# sidecar with channel names, units, compression, every chunk's byte offset
+# and time span, plus the event list. The sidecar is rewritten after every
+# chunk/event so a crash leaves it matching what is on disk.
+
+MAGIC = b"DAQLOG1\n"
+CHUNK_HEADER = struct.Struct("<4sIIQ") # b"CHNK", rows, columns, payload bytes
+DTYPE = "<f8"
+
+COMPRESSORS = {
+    None: lambda b: b,
+    "zlib": zlib.compress,
+    "lzma": lzma.compress,
+}
+DECOMPRESSORS = {
+    None: lambda b: b,
+    "zlib": zlib.decompress,
+    "lzma": lzma.decompress,
+}
+
+
+class BinaryLogger:
+    def __init__(self, channels, units=None, folder="logs_NEW", prefix="daq_log",
+                 chunk_rows=4096, compression=None):
+        if compression not in COMPRESSORS:
+            raise ValueError(f"Unknown compression: {compression}")
+
+        os.makedirs(folder, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.path = os.path.join(folder, f"{prefix}_{timestamp}.dlog")
+        self.index_path = self.path + ".json"
+        self.file = open(self.path, "wb")
+        self.file.write(MAGIC)
+
+        self.channels = list(channels)
+        self.chunk_rows = chunk_rows
+        self.compression = compression
+        units = units or {}
+
+        self.meta = {
+            "version": 1,
+            "columns": ["time_s"] + self.channels,
+            "units": {ch: units.get(ch, "") for ch in self.channels},
+            "dtype": DTYPE,
+            "compression": compression,
+            "chunk_rows": chunk_rows,
+            "chunks": [],
+            "events": [],
+        }
+        self.meta_lock = threading.Lock()
+
+        # Current chunk being filled (columns x rows)
+        self.chunk = np.empty((len(self.channels) + 1, chunk_rows))
+        self.fill = 0
+
+        self.rows_written = 0
+        self.bytes_written = len(MAGIC)
+
+        # Compression + disk writes happen on a writer thread
+        self.queue = queue.SimpleQueue()
+        self.thread = threading.Thread(target=self._writer_loop, daemon=True)
+        self.thread.start()
+
+    # ---- DATA ----
+    def write_block(self, times, data):
+        # times (n,), data (channels x n)
+        n = len(times)
+        done = 0
+        while done < n:
+            take = min(n - done, self.chunk_rows - self.fill)
+            self.chunk[0, self.fill:self.fill + take] = times[done:done + take]
+            self.chunk[1:, self.fill:self.fill + take] = data[:, done:done + take]
+            self.fill += take
+            done += take
+
+            if self.fill == self.chunk_rows:
+                self._submit_chunk()
+
+    def write_rows(self, rows):
+        # CSVLogger-style rows: [t, values..., event]
+        for row in rows:
+            if row[-1]:
+                self.log_event(row[0], row[-1])
+            else:
+                self.write_block([row[0]], np.array(row[1:-1], dtype=float).reshape(-1, 1))
+
+    def write_row(self, row):
+        self.write_rows([row])
+
+    def log_event(self, t, name):
+        with self.meta_lock:
+            self.meta["events"].append([float(t), name])
+        self.queue.put("index")
+
+    def _submit_chunk(self):
+        if self.fill == 0:
+            return
+        self.queue.put(self.chunk[:, :self.fill].copy())
+        self.fill = 0
+
+    # ---- WRITER THREAD ----
+    def _writer_loop(self):
+        compress = COMPRESSORS[self.compression]
+
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            if isinstance(item, str): # Event added, just refresh the sidecar
+                self._write_index()
+                continue
+
+            columns = item
+            payload = compress(np.ascontiguousarray(columns, dtype=DTYPE).tobytes())
+            header = CHUNK_HEADER.pack(b"CHNK", columns.shape[1], columns.shape[0], len(payload))
+
+            self.file.write(header)
+            offset = self.file.tell()
+            self.file.write(payload)
+            self.file.flush()
+
+            with self.meta_lock:
+                self.meta["chunks"].append({
+                    "offset": offset,
+                    "length": len(payload),
+                    "rows": columns.shape[1],
+                    "t_first": float(columns[0, 0]),
+                    "t_last": float(columns[0, -1]),
+                })
+            self.rows_written += columns.shape[1]
+            self.bytes_written += len(header) + len(payload)
+            self._write_index()
+
+    def _write_index(self):
+        with self.meta_lock:
+            text = json.dumps(self.meta)
+        tmp = self.index_path + ".tmp"
+        with open(tmp, "w") as f:
+            f.write(text)
+        os.replace(tmp, self.index_path)
+
+    def stats(self):
+        return {
+            "rows_written": self.rows_written,
+            "bytes_written": self.bytes_written,
+            "chunks": len(self.meta["chunks"]),
+        }
+
+    def close(self):
+        self._submit_chunk() # Partial last chunk
+        self.queue.put(None)
+        self.thread.join()
+        self.file.close()
+        self._write_index()
+        print(f"Binary log saved to {self.path}")
+
+
+# ---- READING / EXPORT ----
+def read_index(path):
+    with open(path + ".json") as f:
+        return json.load(f)
+
+
+def read_chunk(file, meta, chunk):
+    # One chunk -> (columns x rows) float64 array
+    file.seek(chunk["offset"])
+    payload = DECOMPRESSORS[meta["compression"]](file.read(chunk["length"]))
+    return np.frombuffer(payload, dtype=meta["dtype"]).reshape(len(meta["columns"]), chunk["rows"])
+
+
+def export_csv(path, csv_path=None):
+    # Convert a .dlog to the same CSV layout CSVLogger writes
+    meta = read_index(path)
+    csv_path = csv_path or os.path.splitext(path)[0] + ".csv"
+    n_ch = len(meta["columns"]) - 1
+    events = sorted(meta["events"])
+    e = 0
+
+    with open(path, "rb") as f, open(csv_path, "w", newline="") as out:
+        writer = csv.writer(out)
+        writer.writerow(meta["columns"] + ["event"])
+
+        for chunk in meta["chunks"]:
+            columns = read_chunk(f, meta, chunk)
+            rows = columns.T.tolist()
+
+            for row in rows:
+                # Events go in time order between data rows
+                while e < len(events) and events[e][0] <= row[0]:
+                    writer.writerow([events[e][0]] + [""] * n_ch + [events[e][1]])
+                    e += 1
+                writer.writerow(row + [""])
+
+        for t, name in events[e:]:
+            writer.writerow([t] + [""] * n_ch + [name])
+
+    print(f"Exported {path} -> {csv_path}")
+    return csv_path
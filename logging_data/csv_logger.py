@@ -1,20 +1,124 @@
 import csv
 import os
+import queue
+import threading
+import time
 from datetime import datetime
+import numpy as np
 
 class CSVLogger:
-    def __init__(self, headers, folder="logs_NEW", prefix="daq_log"):
+    def __init__(self, headers, folder="logs_NEW", prefix="daq_log",
+                 threaded=False, max_queued_rows=100000, flush_interval_s=1.0, fsync=True):
         os.makedirs(folder, exist_ok=True)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         self.path = os.path.join(folder, f"{prefix}_{timestamp}.csv")
         self.file = open(self.path, "w", newline="")
         self.writer = csv.writer(self.file)
         self.writer.writerow(headers)
+        self.n_columns = len(headers) # time_s, channels..., event
+
+        # Counters
+        self.rows_written = 0
+        self.bytes_written = 0
+        self.dropped_rows = 0
+        self.queued_rows = 0
+
+        # Threaded mode: callers only queue rows, a writer thread does the disk work
+        # in batches and flushes/fsyncs every flush_interval_s. If the queue is full
+        # rows are dropped (and counted) rather than blocking acquisition.
+        self.threaded = threaded
+        self.max_queued_rows = max_queued_rows
+        self.flush_interval = flush_interval_s
+        self.fsync = fsync
+
+        if threaded:
+            self.queue = queue.SimpleQueue()
+            self.queue_lock = threading.Lock()
+            self.thread = threading.Thread(target=self._writer_loop, daemon=True)
+            self.thread.start()
 
     def write_row(self, row):
-        self.writer.writerow(row)
+        self.write_rows([row])
 
-    def close(self):
+    def write_block(self, times, data):
+        # times (n,), data (channels x n) -> one row per sample, empty event column
+        rows = np.vstack((times, data)).T.tolist()
+        for row in rows:
+            row.append("")
+        self.write_rows(rows)
+
+    def log_event(self, t, name):
+        # Blank data columns so the structure stays consistent
+        self.write_row([t] + [""] * (self.n_columns - 2) + [name])
+
+    def write_rows(self, rows):
+        if not self.threaded:
+            for row in rows:
+                self.bytes_written += self.writer.writerow(row)
+            self.rows_written += len(rows)
+            return
+
+        with self.queue_lock:
+            if self.queued_rows + len(rows) > self.max_queued_rows:
+                self.dropped_rows += len(rows)
+                return
+            self.queued_rows += len(rows)
+        self.queue.put(rows)
+
+    def _writer_loop(self):
+        last_flush = time.monotonic()
+        running = True
+
+        while running:
+            try:
+                batches = [self.queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                batches = []
+
+            # Drain whatever else is waiting so it goes out in one go
+            while True:
+                try:
+                    batches.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            n = 0
+            for rows in batches:
+                if rows is None: # close() sentinel
+                    running = False
+                    continue
+                for row in rows:
+                    self.bytes_written += self.writer.writerow(row)
+                n += len(rows)
+
+            self.rows_written += n
+            with self.queue_lock:
+                self.queued_rows -= n
+
+            now = time.monotonic()
+            if now - last_flush >= self.flush_interval:
+                self._flush()
+                last_flush = now
+
+    def _flush(self):
         self.file.flush()
+        if self.fsync:
+            os.fsync(self.file.fileno())
+
+    def stats(self):
+        return {
+            "queue_depth": self.queued_rows,
+            "rows_written": self.rows_written,
+            "bytes_written": self.bytes_written,
+            "dropped_rows": self.dropped_rows,
+        }
+
+    def close(self):
+        if self.threaded:
+            self.queue.put(None)
+            self.thread.join()
+        self._flush()
         self.file.close()
         print(f"CSV log saved to {self.path}")
+        if self.dropped_rows:
+            print(f"[LOGGER] {self.dropped_rows} rows dropped (queue full)")
@@ -0,0 +1,209 @@
+import bisect
+import csv
+import os
+import numpy as np
+from logging_data.binary_logger import read_index, DECOMPRESSORS
+
+# Random-access reader for recorded logs.
+# Binary .dlog files are memory-mapped and located through the chunk table in
+# their sidecar. CSV logs get a sparse (time -> byte offset) index plus the
+# event list built once and cached next to the file as <log>.csv.idx.npz.
+# Either way, seeking to a time or a named event (IGNITION_START, ABORT,
+# MOV_OPEN, ...) is a binary search, and only the requested channels are parsed.
+
+INDEX_EVERY = 256 # CSV rows between index entries
+
+
+def split_row(line):
+    # Data rows are plain numbers, only event text can be quoted (and hold commas)
+    if b'"' in line:
+        return [field.encode() for field in next(csv.reader([line.decode()]))]
+    return line.rstrip(b"\r\n").split(b",")
+
+
+class LogReader:
+    def __init__(self, path):
+        self.path = path
+        if path.endswith(".dlog"):
+            self._open_binary()
+        else:
+            self._open_csv()
+
+        # Event name -> its times in order, so find_event is a dict lookup
+        self.event_times = {}
+        for t, name in self.events:
+            self.event_times.setdefault(name, []).append(t)
+
+    # ---- PUBLIC API ----
+    def time_range(self):
+        return self.t_first, self.t_last
+
+    def find_event(self, name, occurrence=0):
+        # Time of the n-th event called `name` (None if it never happened)
+        matches = self.event_times.get(name, [])
+        if occurrence < len(matches):
+            return matches[occurrence]
+        return None
+
+    def read(self, channels=None, t_start=None, t_end=None):
+        # {"time_s": t, channel: values, ...} for t_start <= t <= t_end
+        channels = self.channels if channels is None else list(channels)
+        for ch in channels:
+            if ch not in self.channels:
+                raise KeyError(f"Unknown channel: {ch}")
+
+        t_start = -np.inf if t_start is None else t_start
+        t_end = np.inf if t_end is None else t_end
+
+        if self.binary:
+            return self._read_binary(channels, t_start, t_end)
+        return self._read_csv(channels, t_start, t_end)
+
+    def read_event(self, name, before=1.0, after=5.0, channels=None, occurrence=0):
+        # Window around an event, e.g. read_event("IGNITION_START", 0.5, 3.0)
+        t = self.find_event(name, occurrence)
+        if t is None:
+            raise KeyError(f"No event {name} in {self.path}")
+        return self.read(channels, t - before, t + after)
+
+    # ---- BINARY ----
+    def _open_binary(self):
+        self.binary = True
+        self.meta = read_index(self.path)
+        self.channels = self.meta["columns"][1:]
+        self.events = sorted((t, e) for t, e in self.meta["events"])
+        self.mm = np.memmap(self.path, dtype=np.uint8, mode="r")
+
+        chunks = self.meta["chunks"]
+        self.chunk_first = [c["t_first"] for c in chunks]
+        self.chunk_last = [c["t_last"] for c in chunks]
+        self.t_first = self.chunk_first[0] if chunks else None
+        self.t_last = self.chunk_last[-1] if chunks else None
+
+    def _chunk_columns(self, chunk):
+        n_cols = len(self.meta["columns"])
+        raw = self.mm[chunk["offset"]:chunk["offset"] + chunk["length"]]
+        if self.meta["compression"] is None:
+            # Zero-copy view straight into the mapped file
+            return raw.view(self.meta["dtype"]).reshape(n_cols, chunk["rows"])
+        payload = DECOMPRESSORS[self.meta["compression"]](raw.tobytes())
+        return np.frombuffer(payload, dtype=self.meta["dtype"]).reshape(n_cols, chunk["rows"])
+
+    def _read_binary(self, channels, t_start, t_end):
+        cols = [0] + [self.channels.index(ch) + 1 for ch in channels]
+
+        # Only chunks whose time span overlaps the request
+        first = bisect.bisect_left(self.chunk_last, t_start)
+        last = bisect.bisect_right(self.chunk_first, t_end)
+
+        parts = []
+        for chunk in self.meta["chunks"][first:last]:
+            columns = self._chunk_columns(chunk)
+            t = columns[0]
+            i0 = np.searchsorted(t, t_start, side="left")
+            i1 = np.searchsorted(t, t_end, side="right")
+            parts.append(columns[cols, i0:i1])
+
+        if parts:
+            out = np.concatenate(parts, axis=1)
+        else:
+            out = np.empty((len(cols), 0))
+
+        result = {"time_s": out[0]}
+        for i, ch in enumerate(channels):
+            result[ch] = out[i + 1]
+        return result
+
+    # ---- CSV ----
+    def _open_csv(self):
+        self.binary = False
+        index_path = self.path + ".idx.npz"
+        stat = os.stat(self.path)
+
+        index = None
+        if os.path.exists(index_path):
+            index = np.load(index_path)
+            # Rebuild if the log changed since the index was made
+            if index["size"] != stat.st_size or index["mtime"] != stat.st_mtime:
+                index = None
+
+        if index is None:
+            index = self._build_csv_index(stat)
+            with open(index_path, "wb") as f:
+                np.savez(f, **index)
+
+        self.header = [str(h) for h in index["header"]]
+        self.channels = self.header[1:-1]
+        self.index_times = index["times"]
+        self.index_offsets = index["offsets"]
+        self.events = list(zip(index["event_times"].tolist(), [str(e) for e in index["event_names"]]))
+        self.t_first = float(index["t_first"])
+        self.t_last = float(index["t_last"])
+
+    def _build_csv_index(self, stat):
+        times, offsets = [], []
+        event_times, event_names = [], []
+        t_first = t_last = np.nan
+        rows = 0
+
+        with open(self.path, "rb") as f:
+            header = f.readline().decode().strip().split(",")
+            offset = f.tell()
+
+            for line in f:
+                fields = split_row(line)
+                t = float(fields[0])
+                event = fields[-1].decode()
+
+                if event:
+                    event_times.append(t)
+                    event_names.append(event)
+                else:
+                    if rows % INDEX_EVERY == 0:
+                        times.append(t)
+                        offsets.append(offset)
+                    if rows == 0:
+                        t_first = t
+                    t_last = t
+                    rows += 1
+
+                offset += len(line)
+
+        order = np.argsort(event_times, kind="stable")
+        return {
+            "header": np.array(header),
+            "times": np.array(times, dtype=float),
+            "offsets": np.array(offsets, dtype=np.int64),
+            "event_times": np.array(event_times, dtype=float)[order],
+            "event_names": np.array(event_names, dtype=str)[order],
+            "t_first": t_first,
+            "t_last": t_last,
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+        }
+
+    def _read_csv(self, channels, t_start, t_end):
+        cols = [0] + [self.header.index(ch) for ch in channels]
+
+        # Start one index entry early, rows between entries may straddle t_start
+        i = max(np.searchsorted(self.index_times, t_start, side="right") - 1, 0)
+        values = []
+
+        if len(self.index_offsets):
+            with open(self.path, "rb") as f:
+                f.seek(int(self.index_offsets[i]))
+                for line in f:
+                    fields = split_row(line)
+                    if fields[-1]: # Event row
+                        continue
+                    t = float(fields[0])
+                    if t > t_end:
+                        break
+                    if t >= t_start:
+                        values.append([float(fields[c]) if fields[c] else np.nan for c in cols])
+
+        out = np.array(values, dtype=float).reshape(-1, len(cols)).T
+        result = {"time_s": out[0]}
+        for k, ch in enumerate(channels):
+            result[ch] = out[k + 1]
+        return result
@@ -1,23 +1,150 @@
 from PyQt6.QtCore import QObject, pyqtSignal
+import threading
 import time
 import config.system_config as system_config
 
+# Heartbeats per source (each LabJack, the stream thread, the DAQ thread) on
+# the monotonic clock. A monitor thread sleeps on a condition variable until
+# the earliest deadline (last beat + timeout), so a silent source is caught
+# within its timeout without polling, and the abort names the source that
+# went quiet. Each source trips once and re-arms when it beats again, or on
+# a system reset (rearm), so a source that is still silent aborts again.
+
+
+class HeartbeatSource:
+    def __init__(self, name, timeout_ns):
+        self.name = name
+        self.timeout_ns = timeout_ns
+        self.last_ns = time.monotonic_ns()
+        self.beats = 0
+        self.timed_out = False
+
+        # Inter-arrival stats (Welford), ns
+        self.mean_interval = 0.0
+        self.m2 = 0.0
+        self.max_interval = 0
+
+    def beat(self, now_ns):
+        if self.beats:
+            interval = now_ns - self.last_ns
+            n = self.beats # Intervals so far, including this one
+            delta = interval - self.mean_interval
+            self.mean_interval += delta / n
+            self.m2 += delta * (interval - self.mean_interval)
+            self.max_interval = max(self.max_interval, interval)
+        self.beats += 1
+        self.last_ns = now_ns
+
+    def stats(self, now_ns):
+        intervals = self.beats - 1
+        return {
+            "age_ms": (now_ns - self.last_ns) / 1e6,
+            "beats": self.beats,
+            "mean_interval_ms": self.mean_interval / 1e6 if intervals > 0 else None,
+            "jitter_ms": (self.m2 / intervals) ** 0.5 / 1e6 if intervals > 1 else None, # Std of inter-arrival
+            "max_interval_ms": self.max_interval / 1e6 if intervals > 0 else None,
+            "timed_out": self.timed_out,
+        }
+
+
 class HeartbeatWatchdog(QObject):
     abort_signal = pyqtSignal(str)
 
-    def __init__(self, timeout_seconds=1.0):
+    def __init__(self, timeout_seconds=None):
         super().__init__()
-        self.last_update_time = time.time()
+        self.timeout_s = timeout_seconds or system_config.HEARTBEAT_TIMEOUT_S
+        self.sources = {}
+        self.cond = threading.Condition()
+        self.running = False
+        self.changed = False # Set with every notify, so the monitor can't miss one
+        self.thread = None
+
+    def register(self, name, timeout_seconds=None):
+        # Deadline starts counting from now
+        timeout_ns = int((timeout_seconds or self.timeout_s) * 1e9)
+        with self.cond:
+            self.sources[name] = HeartbeatSource(name, timeout_ns)
+            self._wake() # Monitor re-plans its next deadline
 
-    def beat(self):
-        # Call this whenever new DAQ data arrives
-        self.last_update_time = time.time()
+    def unregister(self, name):
+        # Source no longer expected to beat (e.g. a device now read through the stream)
+        with self.cond:
+            if self.sources.pop(name, None) is not None:
+                self._wake()
+
+    def beat(self, name="DAQ"):
+        # Call this whenever the source delivers data
+        now = time.monotonic_ns()
+        with self.cond:
+            source = self.sources.get(name)
+            if source is None:
+                return # Not registered, or dropped while a read was in flight
+            if source.timed_out:
+                source.timed_out = False
+                self._wake()
+                print(f"[HEARTBEAT] {name} back after {(now - source.last_ns) / 1e9:.2f}s")
+            source.beat(now)
+
+    def rearm(self):
+        # After a reset: sources still silent trip again on the next check
+        with self.cond:
+            for source in self.sources.values():
+                source.timed_out = False
+            self._wake()
 
     def check(self):
-        timeout = system_config.HEARTBEAT_TIMEOUT_S
-        delta = time.time() - self.last_update_time
+        # Trip any source past its deadline, returns seconds until the next one
+        now = time.monotonic_ns()
+        expired = []
+        next_deadline = None
+        with self.cond:
+            for source in self.sources.values():
+                if source.timed_out:
+                    continue
+                deadline = source.last_ns + source.timeout_ns
+                if now > deadline:
+                    source.timed_out = True
+                    expired.append((source.last_ns, source.name, (now - source.last_ns) / 1e9, source.timeout_ns / 1e9))
+                elif next_deadline is None or deadline < next_deadline:
+                    next_deadline = deadline
+
+        # Whichever went quiet first is reported first (and becomes the first fault),
+        # e.g. a hung LabJack before the DAQ thread stuck waiting on it
+        for _, name, age, timeout in sorted(expired):
+            print(f"[HEARTBEAT TIMEOUT] {name} {age:.2f} > {timeout}s")
+            self.abort_signal.emit(f"{name} HEARTBEAT TIMEOUT")
+
+        return None if next_deadline is None else max(0.0, (next_deadline - now) / 1e9)
+
+    # ---- MONITOR THREAD ----
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self._monitor, daemon=True)
+        self.thread.start()
+
+    def _wake(self):
+        # Caller holds self.cond
+        self.changed = True
+        self.cond.notify()
+
+    def _monitor(self):
+        while self.running:
+            with self.cond:
+                self.changed = False
+            wait = self.check()
+            with self.cond:
+                if self.running and not self.changed:
+                    # Woken early by register() / a recovered source, otherwise at the deadline
+                    self.cond.wait(wait)
+
+    def stop(self):
+        with self.cond:
+            self.running = False
+            self._wake()
+        if self.thread:
+            self.thread.join()
 
-        if delta > timeout:
-            print(f"[HEARTBEAT TIMEOUT] {delta:.2f} > {timeout}s")
-            self.abort_signal.emit("DAQ HEARTBEAT TIMEOUT")
-        
\ No newline at end of file
+    def stats(self):
+        now = time.monotonic_ns()
+        with self.cond:
+            return {name: source.stats(now) for name, source in self.sources.items()}
@@ -0,0 +1,168 @@
+from PyQt6.QtCore import QObject, pyqtSignal
+import numpy as np
+import config.system_config as system_config
+from daq.channels import CHANNEL_INDEX
+
+# Rate-of-change and rolling-statistic safety rules, alongside SensorWatchdog's
+# absolute limits. Rules come from system_config.SAFETY_RULES. Windows are in
+# seconds, turned into a sample count from the acquisition rate seen in the
+# first blocks, so a rule means the same at 200 Hz polling or a 20 kHz stream.
+# Each channel keeps running cumulative sums (count, sum, sum of squares) plus
+# the last `window` samples in rings between blocks, so every new sample costs
+# O(1) whatever the window length.
+
+RULE_TYPES = ("rate", "mean", "std", "deviation")
+
+
+class RollingStats:
+    # Rolling mean/std and dx/dt over the last `window` samples of one channel.
+    # Cumulative sums, x and t of the last `window` samples sit in rings indexed
+    # by absolute sample number % window, so a block of n samples costs O(n)
+    # whatever the window (no rebuilding the window array per call)
+    def __init__(self, window):
+        self.window = window
+        self.min_count = max(2, window // 2) # Valid samples needed (NaN dropouts are skipped)
+
+        # Cumulative [count, sum, sum^2] after each of the last `window` samples,
+        # zeros standing in for "before the first sample"
+        self.cum_ring = np.zeros((3, window))
+        self.x_ring = np.full(window, np.nan)
+        self.t_ring = np.full(window, np.nan)
+        self.total = np.zeros(3) # Running [count, sum, sum^2] up to the newest sample
+        self.seen = 0            # Samples ever added
+        self.since_anchor = 0
+
+    def update(self, t, x):
+        w = self.window
+        n = len(x)
+        valid = ~np.isnan(x)
+        xv = np.where(valid, x, 0.0)
+
+        inc = np.vstack([valid, xv, xv * xv])
+        cum = self.total[:, None] + np.cumsum(inc, axis=1)
+
+        # Sample `window` back from each new one: in the ring for the first
+        # `window` samples of the block, otherwise earlier in this block
+        k = np.arange(n)
+        in_ring = k < w
+        slots = (self.seen + k[in_ring] - w) % w
+        back = k[~in_ring] - w
+
+        cum_back = np.empty((3, n))
+        cum_back[:, in_ring] = self.cum_ring[:, slots]
+        cum_back[:, ~in_ring] = cum[:, back]
+        x_back = np.concatenate([self.x_ring[slots], x[back]])
+        t_back = np.concatenate([self.t_ring[slots], t[back]])
+
+        count, total, total_sq = cum - cum_back
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = total / count
+            std = np.sqrt(np.maximum(total_sq / count - mean * mean, 0.0))
+            # dx/dt between each sample and the one `window` samples before it
+            rate = (x - x_back) / (t - t_back)
+        mean[count < self.min_count] = np.nan
+        std[count < self.min_count] = np.nan
+
+        # Newest `window` samples into the rings
+        m = min(n, w)
+        slots = (self.seen + np.arange(n - m, n)) % w
+        self.cum_ring[:, slots] = cum[:, n - m:]
+        self.x_ring[slots] = x[n - m:]
+        self.t_ring[slots] = t[n - m:]
+        self.total = cum[:, -1].copy()
+        self.seen += n
+
+        # Re-anchor once per window so the sums don't grow without bound (O(1) amortised)
+        self.since_anchor += n
+        if self.since_anchor >= w:
+            self.cum_ring -= self.total[:, None]
+            self.total[:] = 0.0
+            self.since_anchor = 0
+
+        return {"mean": mean, "std": std, "rate": rate}
+
+
+class RuleEngine(QObject):
+    abort_signal = pyqtSignal(str)
+
+    def __init__(self, rules=None):
+        super().__init__()
+        rules = system_config.SAFETY_RULES if rules is None else rules
+
+        self.rules = []
+        self.stats = {} # (channel, window_s) -> RollingStats, shared between rules, built once the rate is known
+        for rule in rules:
+            channel = rule["channel"]
+            if channel not in CHANNEL_INDEX:
+                print(f"[RULES] No channel for rule: {channel}")
+                continue
+            if rule["type"] not in RULE_TYPES:
+                print(f"[RULES] Unknown rule type: {rule['type']}")
+                continue
+            self.rules.append(rule)
+
+        self.violating = [False] * len(self.rules) # Per rule, at the end of the last block
+        self.rearm_pending = False
+        self.t_last = None
+
+    def _build_stats(self, t):
+        # Sample interval from the first block with two samples (or two single-sample blocks)
+        if len(t) > 1:
+            dt = (t[-1] - t[0]) / (len(t) - 1)
+        else:
+            dt = t[0] - self.t_last if self.t_last is not None else 0.0
+        self.t_last = t[-1]
+        if dt <= 0:
+            return False
+
+        for rule in self.rules:
+            key = (rule["channel"], rule["window_s"])
+            if key not in self.stats:
+                self.stats[key] = RollingStats(max(2, round(rule["window_s"] / dt)))
+        print(f"[RULES] Windows sized for {1 / dt:.0f} Hz")
+        return True
+
+    def rearm(self):
+        # After a reset: rules still failing trip again on the next block
+        self.rearm_pending = True
+
+    def evaluate_block(self, t, block):
+        if self.rearm_pending:
+            self.rearm_pending = False
+            self.violating = [False] * len(self.rules)
+        if block.shape[1] == 0:
+            return
+        if self.rules and not self.stats and not self._build_stats(t):
+            return
+
+        values = {
+            key: stats.update(t, block[CHANNEL_INDEX[key[0]]])
+            for key, stats in self.stats.items()
+        }
+
+        for i, rule in enumerate(self.rules):
+            v = values[(rule["channel"], rule["window_s"])]
+            if rule["type"] == "deviation":
+                v = np.abs(v["mean"] - rule["expected"])
+            else:
+                v = v[rule["type"]]
+            self._check(i, rule, v)
+
+    def _check(self, i, rule, v):
+        with np.errstate(invalid="ignore"):
+            over = v > rule.get("max", np.inf)
+            under = v < rule.get("min", -np.inf)
+        bad = over | under
+
+        # Edge triggered: abort when a rule starts failing, not on every sample after
+        starts = bad & ~np.concatenate([[self.violating[i]], bad[:-1]])
+        self.violating[i] = bool(bad[-1])
+        if not starts.any():
+            return
+
+        j = int(np.argmax(starts))
+        label = rule["type"].upper()
+        if over[j]:
+            self.abort_signal.emit(f"{rule['channel']} {label} ({v[j]:.1f} > {rule['max']})")
+        else:
+            self.abort_signal.emit(f"{rule['channel']} {label} ({v[j]:.1f} < {rule['min']})")
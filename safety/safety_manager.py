@@ -1,26 +1,87 @@
-from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtCore import QObject, QThread, pyqtSignal
 from safety.sensor_watchdog import SensorWatchdog
 from safety.heartbeat_watchdog import HeartbeatWatchdog
+from safety.rule_engine import RuleEngine
+from safety.safety_thread import SafetyThread, safe_valve_states
+import config.system_config as system_config
+from safety.system_state import SystemStateMachine
 
 # SAFETY MANAGER WRAPPER
 class SafetyManager(QObject):
     abort_signal = pyqtSignal(str)
 
-    def __init__(self):
+    def __init__(self, daq=None):
         super().__init__()
 
         self.sensor_watchdog = SensorWatchdog()
         self.heartbeat_watchdog = HeartbeatWatchdog()
+        self.rule_engine = RuleEngine()
+        self.state = SystemStateMachine() # Shared with the GUI
+        self.state.on_reset += [self.sensor_watchdog.rearm, self.rule_engine.rearm, self.heartbeat_watchdog.rearm]
 
-        # Forward abort signals to GUI
-        self.sensor_watchdog.abort_signal.connect(self.abort_signal.emit)
-        self.heartbeat_watchdog.abort_signal.connect(self.abort_signal.emit)
+        # With a DAQ backend the watchdogs run on their own real-time thread,
+        # which actuates the safe state itself and then tells the GUI
+        self.thread = None
+        if daq is not None:
+            self.thread = SafetyThread(daq, self.sensor_watchdog, self.heartbeat_watchdog, self.rule_engine, state=self.state)
+            self.thread.abort_signal.connect(self.abort_signal.emit)
+        else:
+            # Forward new abort causes to GUI
+            self.sensor_watchdog.abort_signal.connect(self.forward_abort)
+            self.heartbeat_watchdog.abort_signal.connect(self.forward_abort)
+            self.rule_engine.abort_signal.connect(self.forward_abort)
 
-    def evaluate_sensors(self, data):
-        self.sensor_watchdog.evaluate(data)
+    def forward_abort(self, reason):
+        if self.state.abort(reason):
+            self.abort_signal.emit(reason)
 
-    def heartbeat(self):
-        self.heartbeat_watchdog.beat()
+    def start(self, daq_thread, tracer=None):
+        # Safety thread consumes blocks straight from the acquisition thread
+        self.thread.tracer = tracer
+        daq_thread.add_consumer(self.thread.submit)
 
-    def check_heartbeat(self):
-        self.heartbeat_watchdog.check()
\ No newline at end of file
+        # One heartbeat for the DAQ thread, plus one per device/stream the backend reports
+        self.heartbeat_watchdog.register("DAQ")
+        daq = self.thread.daq
+        if hasattr(daq, "heartbeat_sources"):
+            self.sync_heartbeat_sources(daq.heartbeat_sources())
+            daq.on_heartbeat.append(self.heartbeat_watchdog.beat)
+            # Stream (re)started/stopped, a device moved between polling and streaming
+            daq.on_sources_changed.append(self.sync_heartbeat_sources)
+        if hasattr(daq, "on_reconnect"):
+            daq.on_reconnect.append(self.restore_safe_state)
+        self.heartbeat_watchdog.start()
+
+        self.thread.start(QThread.Priority.TimeCriticalPriority)
+
+    def sync_heartbeat_sources(self, sources):
+        # Watch exactly the backend's current sources (plus the DAQ thread),
+        # new ones start their deadline now, stale ones can't trip forever
+        current = set(self.heartbeat_watchdog.sources) - {"DAQ"}
+        for source in current - set(sources):
+            self.heartbeat_watchdog.unregister(source)
+        for source in set(sources) - current:
+            self.heartbeat_watchdog.register(source)
+
+    def restore_safe_state(self, dev):
+        # A reconnected device powers up with its DIO as inputs, put its valves
+        # back in the safe state unless the system is armed/firing
+        if self.state.state not in ("SAFE", "ABORTED"):
+            return
+        states = {
+            valve: state for valve, state in safe_valve_states().items()
+            if system_config.VALVE_DIO_MAP.get(valve, (None,))[0] == dev
+        }
+        if states:
+            print(f"[SAFETY] {dev} reconnected in {self.state.state}, re-applying safe valve states")
+            self.thread.daq.set_digital_many(states)
+
+    def stop(self):
+        self.heartbeat_watchdog.stop()
+        if self.thread:
+            self.thread.stop()
+
+    def stats(self):
+        result = self.thread.stats() if self.thread else {}
+        result["heartbeat"] = self.heartbeat_watchdog.stats()
+        return result
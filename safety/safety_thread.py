@@ -0,0 +1,117 @@
+from PyQt6.QtCore import QThread, pyqtSignal, Qt
+import queue
+import time
+import numpy as np
+import config.system_config as system_config
+from safety.system_state import SystemStateMachine
+
+# Real-time safety loop, independent of the GUI event loop.
+# DAQ_Thread hands every SampleBlock straight to submit() from the acquisition
+# thread, so the watchdogs see data at acquisition rate even if plotting or a
+# slow disk stalls the GUI. On a trip this thread commands the safe valve
+# states through the DAQ backend itself and only then notifies the GUI.
+# Trips go through the latched SystemStateMachine first, so each distinct
+# cause actuates once and repeats are dropped until the operator resets.
+
+
+def safe_valve_states():
+    # Every valve wired to a DIO line closed, then whatever DIO_SAFE_STATES says
+    # (valves without a VALVE_DIO_MAP entry have nothing to command)
+    states = {v: False for v in system_config.VALVE_DIO_MAP}
+    states.update({v: s for v, s in system_config.DIO_SAFE_STATES.items() if v in system_config.VALVE_DIO_MAP})
+    return states
+
+
+class SafetyThread(QThread):
+    abort_signal = pyqtSignal(str) # Emitted AFTER the safe state has been commanded
+
+    def __init__(self, daq, sensor_watchdog, heartbeat_watchdog, rule_engine=None, tracer=None, state=None):
+        super().__init__()
+        self.daq = daq
+        self.sensor_watchdog = sensor_watchdog
+        self.heartbeat_watchdog = heartbeat_watchdog
+        self.rule_engine = rule_engine
+        self.tracer = tracer
+        self.state = state or SystemStateMachine()
+        self.failed_actuations = 0 # Trips whose safe state didn't reach every device
+        self.use_filtered = system_config.SAFETY_USE_FILTERED
+        self.queue = queue.SimpleQueue()
+        self.running = True
+
+        # Called on this thread before actuating (e.g. stop the ignition sequence)
+        self.on_trip = []
+
+        # Watchdogs trip synchronously on this thread
+        self.sensor_watchdog.abort_signal.connect(self.trip, Qt.ConnectionType.DirectConnection)
+        self.heartbeat_watchdog.abort_signal.connect(self.trip, Qt.ConnectionType.DirectConnection)
+        if self.rule_engine:
+            self.rule_engine.abort_signal.connect(self.trip, Qt.ConnectionType.DirectConnection)
+
+        # Detect -> actuate timing
+        self.current_read_ns = None
+        self.detect_to_actuate_ms = []
+        self.read_to_actuate_ms = []
+
+    def submit(self, block):
+        # Called from the acquisition thread
+        self.queue.put(block)
+
+    def run(self):
+        # No polling: a silent DAQ thread is caught by the heartbeat monitor's own deadline
+        while self.running:
+            block = self.queue.get()
+            if block is None:
+                break
+
+            self.current_read_ns = block.stamps.get("read")
+            self.heartbeat_watchdog.beat("DAQ")
+            data = block.filtered if self.use_filtered and block.filtered is not None else block.data
+            self.sensor_watchdog.evaluate_block(data)
+            if self.rule_engine:
+                self.rule_engine.evaluate_block(block.t, data)
+            if self.tracer:
+                now_ns = time.monotonic_ns()
+                self.tracer.record("safety", block, now_ns)
+                self.tracer.record_age(block, now_ns)
+
+    def trip(self, reason):
+        detect_ns = time.monotonic_ns()
+        if not self.state.abort(reason, detect_ns / 1e9):
+            return # Cause already latched, safe state already commanded
+
+        for callback in self.on_trip:
+            callback()
+
+        failed = self.daq.set_digital_many(safe_valve_states()) or {}
+
+        actuate_ns = time.monotonic_ns()
+        self.detect_to_actuate_ms.append((actuate_ns - detect_ns) / 1e6)
+        if self.current_read_ns is not None:
+            self.read_to_actuate_ms.append((actuate_ns - self.current_read_ns) / 1e6)
+
+        if failed:
+            # Re-applied when the device reconnects (SafetyManager), but say so now
+            self.failed_actuations += 1
+            print(f"[SAFETY THREAD] {reason} -> safe state NOT applied on {failed} "
+                  f"({self.detect_to_actuate_ms[-1]:.2f} ms)")
+        else:
+            print(f"[SAFETY THREAD] {reason} -> safe state in {self.detect_to_actuate_ms[-1]:.2f} ms")
+        self.abort_signal.emit(reason)
+
+    def stats(self):
+        # Measured bound on how fast a detected fault reaches the valves
+        result = {
+            "trips": len(self.detect_to_actuate_ms),
+            "suppressed": self.state.suppressed(),
+            "failed_actuations": self.failed_actuations,
+        }
+        for key, values in (("detect_to_actuate", self.detect_to_actuate_ms),
+                            ("read_to_actuate", self.read_to_actuate_ms)):
+            if values:
+                result[key] = {"max_ms": max(values), "p99_ms": float(np.percentile(values, 99))}
+        return result
+
+    def stop(self):
+        self.running = False
+        self.queue.put(None)
+        self.wait()
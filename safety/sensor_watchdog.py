@@ -1,38 +1,73 @@
 from PyQt6.QtCore import QObject, pyqtSignal
+import numpy as np
 import config.system_config as system_config
+from daq.channels import CHANNELS, CHANNEL_INDEX
 
 class SensorWatchdog(QObject):
     abort_signal = pyqtSignal(str)
 
+    # Add 3 overpressure/overtemp counts to avoid noisy data
+    DEBOUNCE = 3
+
     def __init__(self):
         super().__init__()
 
-        # Add 3 overpressure/overtemp counts to avoid noisy data
-        self.violation_counts_pressure = {}
-        self.violation_counts_temp = {}
+        # PRESSURE_LIMITS/TEMP_LIMITS compiled into arrays aligned with CHANNELS,
+        # so a whole channels x samples block is checked in one comparison
+        self.limits = np.full(len(CHANNELS), np.inf)
+        self.limit_values = [None] * len(CHANNELS) # As written in config, for messages
+        self.kinds = [""] * len(CHANNELS)
+        for limits, kind in ((system_config.PRESSURE_LIMITS, "OVERPRESSURE"),
+                             (system_config.TEMP_LIMITS, "OVERTEMP")):
+            for channel, limit in limits.items():
+                if channel not in CHANNEL_INDEX:
+                    print(f"[WATCHDOG] No channel for limit: {channel}")
+                    continue
+                i = CHANNEL_INDEX[channel]
+                self.limits[i] = limit
+                self.limit_values[i] = limit
+                self.kinds[i] = kind
+
+        # Consecutive violations per channel, carried across blocks
+        self.violation_counts = np.zeros(len(CHANNELS), dtype=np.int64)
+        self.rearm_pending = False # Set by rearm(), applied on the evaluating thread
 
     def evaluate(self, data: dict):
+        # Single sample dict, missing channels count as no violation
+        self.evaluate_block(np.array([[data.get(ch, np.nan)] for ch in CHANNELS], dtype=float))
+
+    def rearm(self):
+        # After a reset: channels still over their limit count up again and re-trip
+        self.rearm_pending = True
+
+    def evaluate_block(self, block):
+        # channels x samples block in CHANNELS order
+        if self.rearm_pending:
+            self.rearm_pending = False
+            self.violation_counts = np.zeros(len(CHANNELS), dtype=np.int64)
+
+        n = block.shape[1]
+        if n == 0:
+            return
+
+        with np.errstate(invalid="ignore"):
+            over = block > self.limits[:, None] # NaN -> not over, resets the count
+
+        # Run length of violations ending at each sample:
+        # distance back to the last OK sample, or (carried count + samples so far) if none
+        idx = np.arange(n)
+        last_ok = np.where(over, -1, idx)
+        np.maximum.accumulate(last_ok, axis=1, out=last_ok)
+        runs = idx - last_ok
+        runs += np.where(last_ok < 0, self.violation_counts[:, None], 0)
+
+        self.violation_counts = runs[:, -1].copy()
 
-        # Pressure checks
-        for channel, limit in system_config.PRESSURE_LIMITS.items():
-            if channel in data and data[channel] > limit:
-                self.violation_counts_pressure[channel] = self.violation_counts_pressure.get(channel, 0) + 1
-            else:
-                self.violation_counts_pressure[channel] = 0
-                
-            if self.violation_counts_pressure[channel] >= 3:
-                self.abort_signal.emit(
-                    f"{channel} OVERPRESSURE ({data[channel]:.1f} > {limit})"
-                )
-
-        # Temperature checks
-        for channel, limit in system_config.TEMP_LIMITS.items():
-            if channel in data and data[channel] > limit:
-                self.violation_counts_temp[channel] = self.violation_counts_temp.get(channel, 0) + 1
-            else:
-                self.violation_counts_temp[channel] = 0
-                
-            if self.violation_counts_temp[channel] >= 3:
-                self.abort_signal.emit(
-                    f"{channel} OVERTEMP ({data[channel]:.1f} > {limit})"
-                )
\ No newline at end of file
+        # Edge triggered: only the sample where a run reaches DEBOUNCE,
+        # a channel that stays over the limit doesn't keep re-tripping
+        tripped = runs == self.DEBOUNCE
+        for i in np.flatnonzero(tripped.any(axis=1)):
+            j = int(np.argmax(tripped[i]))
+            self.abort_signal.emit(
+                f"{CHANNELS[i]} {self.kinds[i]} ({block[i, j]:.1f} > {self.limit_values[i]})"
+            )
@@ -0,0 +1,99 @@
+from PyQt6.QtCore import QObject, pyqtSignal
+import threading
+import time
+
+# Latched system state: SAFE -> ARMED -> FIRING -> ARMED, any -> ABORTED.
+# ABORTED stays latched until the operator resets it, which returns to SAFE
+# (never straight back to ARMED). Aborts are deduplicated by cause, so the
+# safety thread and GUI act once per distinct fault however many samples
+# keep violating. The first fault and its time are kept for the operator.
+# Resetting re-arms the watchdogs (on_reset), so a fault that is still
+# present trips again straight away rather than staying silent.
+
+STATES = ("SAFE", "ARMED", "FIRING", "ABORTED")
+
+TRANSITIONS = {
+    ("SAFE", "ARMED"),
+    ("ARMED", "SAFE"),
+    ("ARMED", "FIRING"),
+    ("FIRING", "ARMED"),
+    ("ABORTED", "SAFE"), # Operator reset only
+}
+
+
+def abort_cause(reason):
+    # "CC_pressure OVERPRESSURE (612.3 > 600)" -> "CC_pressure OVERPRESSURE"
+    return reason.split(" (")[0]
+
+
+class SystemStateMachine(QObject):
+    state_changed = pyqtSignal(str)
+
+    def __init__(self):
+        super().__init__()
+        self.state = "SAFE"
+        self.lock = threading.Lock() # Aborts come from the safety thread and the GUI
+
+        self.first_fault = None # {"reason", "t"} (t on the monotonic clock)
+        self.causes = {}        # cause -> {"reason", "t", "count"} since the last reset
+
+        # Called after a reset, e.g. watchdogs forgetting which faults they already reported
+        self.on_reset = []
+
+    def _transition(self, new_state):
+        with self.lock:
+            if (self.state, new_state) not in TRANSITIONS:
+                return False
+            self.state = new_state
+        self.state_changed.emit(new_state)
+        return True
+
+    def arm(self):
+        return self._transition("ARMED")
+
+    def disarm(self):
+        return self._transition("SAFE")
+
+    def fire(self):
+        return self._transition("FIRING")
+
+    def fire_complete(self):
+        return self._transition("ARMED")
+
+    def abort(self, reason, t=None):
+        # True if this is a new cause, which the caller should act on
+        t = time.monotonic() if t is None else t
+        cause = abort_cause(reason)
+
+        with self.lock:
+            if cause in self.causes:
+                self.causes[cause]["count"] += 1
+                return False
+
+            self.causes[cause] = {"reason": reason, "t": t, "count": 1}
+            changed = self.state != "ABORTED"
+            if self.first_fault is None:
+                self.first_fault = {"reason": reason, "t": t}
+            self.state = "ABORTED"
+
+        if changed:
+            self.state_changed.emit("ABORTED")
+        return True
+
+    def reset(self):
+        # Operator acknowledges the fault, clears the latch
+        with self.lock:
+            if self.state != "ABORTED":
+                return False
+            self.state = "SAFE"
+            self.first_fault = None
+            self.causes = {}
+        for callback in self.on_reset:
+            callback()
+        self.state_changed.emit("SAFE")
+        return True
+
+    def suppressed(self):
+        # Repeat trips swallowed since the last reset
+        with self.lock:
+            return sum(c["count"] - 1 for c in self.causes.values())
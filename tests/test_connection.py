@@ -0,0 +1,178 @@
+import threading
+import time
+import types
+import numpy as np
+import config.system_config as system_config
+from daq.connection_manager import ConnectionManager
+from daq.daq_manager import DAQManager
+
+
+class FakeLJM:
+    # Just enough of labjack.ljm for DAQManager: devices whose IP is in `down`
+    # refuse to open, handles in `dead` fail every call
+    class LJMError(Exception):
+        pass
+
+    constants = types.SimpleNamespace(GND=199)
+
+    def __init__(self):
+        self.down = set()
+        self.dead = set()
+        self.handles = {} # handle -> ip
+        self.writes = []  # (handle, names)
+        self.lock = threading.Lock()
+
+    def _check(self, handle):
+        if handle in self.dead:
+            raise self.LJMError(f"handle {handle} not responding")
+
+    def openS(self, device_type, connection_type, ip):
+        if ip in self.down:
+            raise self.LJMError(f"{ip} not found")
+        with self.lock:
+            handle = len(self.handles) + 1
+            self.handles[handle] = ip
+        return handle
+
+    def close(self, handle):
+        pass
+
+    def eWriteName(self, handle, name, value):
+        self._check(handle)
+
+    def eWriteNames(self, handle, n, names, values):
+        self._check(handle)
+        self.writes.append((handle, list(names)))
+
+    def eReadName(self, handle, name):
+        self._check(handle)
+        return int(time.monotonic() * 40e6) % 2**32
+
+    def eReadNames(self, handle, n, names):
+        self._check(handle)
+        return [self.eReadName(handle, name) if name == "CORE_TIMER" else 1.0 for name in names]
+
+    def namesToAddresses(self, n, names):
+        return list(range(n)), [3] * n
+
+    def eStreamStart(self, handle, scans_per_read, n, addresses, scan_rate):
+        self._check(handle)
+        self.stream_channels = n
+        return scan_rate
+
+    def eStreamRead(self, handle):
+        time.sleep(0.005)
+        self._check(handle)
+        return [1.0] * (10 * self.stream_channels), 0, 0
+
+    def eStreamStop(self, handle):
+        self._check(handle)
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def manager(monkeypatch, stream=False, down=()):
+    monkeypatch.setattr(system_config, "STREAM_ENABLED", stream)
+    monkeypatch.setattr(system_config, "RECONNECT_BACKOFF_S", 0.01)
+    fake = FakeLJM()
+    fake.down.update(down)
+    daq = DAQManager(ljm_module=fake)
+    events = []
+    daq.on_event.append(lambda name, t: events.append(name))
+    return fake, daq, events
+
+
+def test_reconnect_backs_off_up_to_the_max():
+    fake = FakeLJM()
+    fake.down.add(system_config.T7_IP)
+    cm = ConnectionManager({"T7": system_config.T7_IP}, ljm_module=fake, backoff_s=0.01, backoff_max_s=0.04)
+
+    delays = []
+    class RecordingEvent(threading.Event):
+        def wait(self, timeout=None):
+            delays.append(timeout)
+            if len(delays) == 5:
+                fake.down.clear() # Fifth attempt succeeds
+            return self.is_set()
+    cm.stopped = RecordingEvent()
+
+    reconnected = threading.Event()
+    cm.on_reconnect.append(lambda name: reconnected.set())
+    cm.open_all()
+    assert reconnected.wait(5)
+    assert delays == [0.01, 0.02, 0.04, 0.04, 0.04]
+    assert cm.devices["T7"].connected
+    cm.close()
+
+
+def test_unexpected_error_does_not_end_the_retries():
+    fake = FakeLJM()
+    fake.down.add(system_config.T7_IP)
+    open_s = fake.openS
+    def flaky_open(*args):
+        if fake.down:
+            fake.down.clear()
+            raise OSError("network unreachable") # Not an LJMError
+        return open_s(*args)
+    fake.openS = flaky_open
+    cm = ConnectionManager({"T7": system_config.T7_IP}, ljm_module=fake, backoff_s=0.01)
+
+    reconnected = threading.Event()
+    cm.on_reconnect.append(lambda name: reconnected.set())
+    cm.device_lost("T7")
+    assert reconnected.wait(5)
+    assert cm.devices["T7"].connected
+    cm.close()
+
+
+def test_lost_device_reconnects_and_is_reconfigured(monkeypatch):
+    fake, daq, events = manager(monkeypatch)
+    try:
+        old = daq.devices["T7_PRO"].handle
+        fake.dead.add(old)
+
+        data = daq.read_analog()
+        assert np.isnan(data["Ox_tank_temp"]) and data["CC_pressure"] == 1.0
+        wait_for(lambda: "T7_PRO RECONNECTED" in events)
+
+        new = daq.devices["T7_PRO"].handle
+        assert new != old and events[:2] == ["T7_PRO DISCONNECTED", "T7_PRO RECONNECTED"]
+        assert any(handle == new for handle, _ in fake.writes) # Channel config reapplied
+        assert daq.read_analog()["Ox_tank_temp"] == 1.0
+    finally:
+        daq.close()
+
+
+def test_stream_restarts_on_the_new_handle(monkeypatch):
+    fake, daq, events = manager(monkeypatch, stream=True)
+    try:
+        old = daq.stream.handle
+        fake.dead.add(old)
+        wait_for(lambda: daq.stream is not None and daq.stream.handle != old)
+
+        assert events == ["T7 DISCONNECTED", "T7 RECONNECTED"]
+        assert daq.stream.running
+        assert "T7_STREAM" in daq.heartbeat_sources()
+    finally:
+        daq.close()
+
+
+def test_stream_starts_once_the_t7_comes_up(monkeypatch):
+    fake, daq, events = manager(monkeypatch, stream=True, down=[system_config.T7_IP])
+    try:
+        sources = []
+        daq.on_sources_changed.append(sources.append)
+        assert daq.stream is None
+        assert sorted(daq.heartbeat_sources()) == ["T7", "T7_PRO"] # Polled meanwhile
+
+        fake.down.clear()
+        wait_for(lambda: daq.stream is not None)
+        wait_for(lambda: sources and "T7_STREAM" in sources[-1])
+        assert sorted(sources[-1]) == ["T7_PRO", "T7_STREAM"]
+    finally:
+        daq.close()
@@ -0,0 +1,42 @@
+import numpy as np
+from daq.channels import CHANNELS, CHANNEL_INDEX
+from daq.filters import FilterBank
+
+FILTERS = {
+    "CC_pressure": {"type": "iir", "cutoff_hz": 20},
+    "thrust": {"type": "moving_average", "window": 10},
+    "Ox_tank_pressure": {"type": "median", "window": 5},
+}
+ROWS = [CHANNEL_INDEX[ch] for ch in FILTERS]
+
+
+def block(n, start=0):
+    t = (start + np.arange(n)) / 1000
+    data = np.sin(2 * np.pi * 5 * t) + np.zeros((len(CHANNELS), 1))
+    return t, data
+
+
+def test_leading_nans_only_blank_their_own_samples():
+    t, data = block(100)
+    data[:, :3] = np.nan
+    out = FilterBank(FILTERS).process(t, data)
+    assert np.isnan(out[ROWS, :3]).all()
+    assert not np.isnan(out[ROWS, 3:]).any()
+
+
+def test_all_nan_block_then_data():
+    bank = FilterBank(FILTERS)
+    t, data = block(50)
+    data[:] = np.nan
+    assert np.isnan(bank.process(t, data)[ROWS]).all()
+    t, data = block(50, start=50)
+    assert not np.isnan(bank.process(t, data)[ROWS]).any()
+
+
+def test_split_blocks_match_one_block():
+    t, data = block(500)
+    data[:, 200:220] = np.nan
+    whole = FilterBank(FILTERS).process(t, data)
+    bank = FilterBank(FILTERS)
+    parts = [bank.process(t[a:b], data[:, a:b]) for a, b in ((0, 1), (1, 37), (37, 210), (210, 500))]
+    np.testing.assert_allclose(np.hstack(parts)[ROWS], whole[ROWS], atol=1e-9)
@@ -0,0 +1,40 @@
+import numpy as np
+import config.system_config as system_config
+from daq.channels import CHANNELS
+from logging_data.csv_logger import CSVLogger
+from logging_data.binary_logger import BinaryLogger
+from logging_data.log_reader import LogReader
+
+# Much bigger than the GUI's display ring, all of it has to reach the file
+N = 20 * system_config.MAX_DATA_POINTS
+
+
+def big_block():
+    t = np.arange(N) / 20000
+    data = np.arange(N) + np.arange(len(CHANNELS))[:, None] * 0.5
+    return t, data
+
+
+def test_csv_logger_keeps_a_block_bigger_than_the_ring(tmp_path):
+    t, data = big_block()
+    logger = CSVLogger(["time_s"] + CHANNELS + ["event"], folder=str(tmp_path), threaded=True, fsync=False)
+    logger.write_block(t, data)
+    logger.close()
+
+    assert logger.stats()["dropped_rows"] == 0
+    assert logger.rows_written == N
+    out = LogReader(logger.path).read()
+    np.testing.assert_allclose(out["time_s"], t)
+    np.testing.assert_allclose(out[CHANNELS[-1]], data[-1])
+
+
+def test_binary_logger_keeps_a_block_bigger_than_the_ring(tmp_path):
+    t, data = big_block()
+    logger = BinaryLogger(CHANNELS, folder=str(tmp_path), chunk_rows=4096)
+    logger.write_block(t, data)
+    logger.close()
+
+    assert logger.rows_written == N
+    out = LogReader(logger.path).read()
+    np.testing.assert_allclose(out["time_s"], t)
+    np.testing.assert_allclose(out[CHANNELS[0]], data[0])
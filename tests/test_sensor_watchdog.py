@@ -0,0 +1,53 @@
+import numpy as np
+import config.system_config as system_config
+from daq.channels import CHANNELS, CHANNEL_INDEX
+from safety.sensor_watchdog import SensorWatchdog
+
+CHANNEL = "CC_pressure"
+LIMIT = system_config.PRESSURE_LIMITS[CHANNEL]
+
+
+def block(*values):
+    # One block, CHANNEL gets `values`, everything else stays at 0
+    data = np.zeros((len(CHANNELS), len(values)))
+    data[CHANNEL_INDEX[CHANNEL]] = values
+    return data
+
+
+def watchdog():
+    wd = SensorWatchdog()
+    trips = []
+    wd.abort_signal.connect(trips.append)
+    return wd, trips
+
+
+def test_run_split_across_blocks_trips_once():
+    wd, trips = watchdog()
+    over = LIMIT + 1
+    wd.evaluate_block(block(0, 0, over, over)) # DEBOUNCE - 1 at the end of the block
+    assert trips == []
+    wd.evaluate_block(block(over + 1, over, 0))
+    assert trips == [f"{CHANNEL} OVERPRESSURE ({over + 1:.1f} > {LIMIT})"]
+
+
+def test_ok_sample_at_block_start_breaks_the_run():
+    wd, trips = watchdog()
+    over = LIMIT + 1
+    wd.evaluate_block(block(over, over))
+    wd.evaluate_block(block(0, over, over))
+    wd.evaluate_block(block(np.nan, over, over)) # NaN counts as not over
+    assert trips == []
+
+
+def test_staying_over_does_not_retrip_until_rearmed():
+    wd, trips = watchdog()
+    over = LIMIT + 1
+    for _ in range(5):
+        wd.evaluate_block(block(over, over))
+    assert len(trips) == 1
+
+    wd.rearm()
+    wd.evaluate_block(block(over, over)) # Count starts again from zero
+    assert len(trips) == 1
+    wd.evaluate_block(block(over))
+    assert len(trips) == 2